@@ -641,6 +641,47 @@ class Agent:
         Raises:
             Exception: If execution fails
         """
+        initial_state = self._start_task(task)
+
+        # Run the graph
+        try:
+            final_state = self.graph.invoke(initial_state, config={"recursion_limit": self.recursion_limit})
+        except Exception as e:
+            if self.verbose:
+                print(f"\n❌ Error during execution: {e}")
+            raise
+        else:
+            return self._finish_task(final_state)
+
+    async def arun(self, task: str) -> dict[str, Any]:
+        """Run an agentic task from start to finish without blocking the event loop.
+
+        Same as run(), but drives the graph with ainvoke. Tool calls are awaited
+        through the tools' coroutines and model calls run in worker threads.
+
+        Args:
+            task: The task to accomplish
+
+        Returns:
+            Final state dictionary with results
+
+        Raises:
+            Exception: If execution fails
+        """
+        initial_state = self._start_task(task)
+
+        # Run the graph
+        try:
+            final_state = await self.graph.ainvoke(initial_state, config={"recursion_limit": self.recursion_limit})
+        except Exception as e:
+            if self.verbose:
+                print(f"\n❌ Error during execution: {e}")
+            raise
+        else:
+            return self._finish_task(final_state)
+
+    def _start_task(self, task: str) -> AgentState:
+        """Build the initial graph state for a task."""
         # Initial state
         initial_state: AgentState = {
             "messages": [],
@@ -656,21 +697,17 @@ class Agent:
         if self.verbose:
             print(f"🚀 Starting agentic task: {task}\n")
 
-        # Run the graph
-        try:
-            final_state = self.graph.invoke(initial_state, config={"recursion_limit": self.recursion_limit})
-        except Exception as e:
-            if self.verbose:
-                print(f"\n❌ Error during execution: {e}")
-            raise
-        else:
-            if self.verbose:
-                print("\n✅ Task completed!")
-                print(f"\n📝 Final Answer:\n{final_state.get('final_answer', 'No answer provided')}")
+        return initial_state
+
+    def _finish_task(self, final_state: Any) -> dict[str, Any]:
+        """Report and store the final graph state of a task."""
+        if self.verbose:
+            print("\n✅ Task completed!")
+            print(f"\n📝 Final Answer:\n{final_state.get('final_answer', 'No answer provided')}")
 
-            # Store results
-            self._results = final_state
-            return final_state  # type: ignore[no-any-return]
+        # Store results
+        self._results = final_state
+        return final_state  # type: ignore[no-any-return]
 
     def display_trace(self) -> None:  # noqa: C901
         """Display a formatted trace of all messages and tool calls.
@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.prebuilt import ToolNode
 
 from alfredo.agentic.prompts import (
@@ -81,6 +82,9 @@ def create_agent_node(
     Returns:
         Agent node function
     """
+    # (task, plan, prompt) of the last system prompt built; the agent node runs
+    # once per tool round with the same task and plan, so the prompt is reused
+    last_system_prompt: Optional[tuple[str, str, str]] = None
 
     def agent_node(state: AgentState) -> dict[str, Any]:
         """Perform reasoning and decide on next action.
@@ -96,7 +100,12 @@ def create_agent_node(
         messages = list(state["messages"])
 
         # Get system prompt content
-        system_prompt = get_agent_system_prompt(task, plan, tools=tools, custom_template=template)
+        nonlocal last_system_prompt
+        if last_system_prompt is not None and last_system_prompt[:2] == (task, plan):
+            system_prompt = last_system_prompt[2]
+        else:
+            system_prompt = get_agent_system_prompt(task, plan, tools=tools, custom_template=template)
+            last_system_prompt = (task, plan, system_prompt)
 
         # If messages is empty (happens when planning is disabled), create both system and human messages
         # Some models (like GLM) reject conversations without a HumanMessage when tools are bound
@@ -133,13 +142,15 @@ def create_tools_node(tools: Sequence[Any]) -> Any:
     """Create the tools node that executes tool calls.
 
     This wraps LangGraph's ToolNode and adds special handling for todo list tools
-    to sync the todo_list state between AgentState and TodoStateManager.
+    to sync the todo_list state between AgentState and TodoStateManager. The
+    node supports both invoke and ainvoke; under ainvoke the tool calls of a
+    message are awaited together through the tools' coroutines.
 
     Args:
         tools: Sequence of available tools (BaseTool or compatible)
 
     Returns:
-        Tools node function
+        Tools node runnable
     """
     # Check if todo tools are present
     tool_names = {getattr(t, "name", "") for t in tools}
@@ -152,49 +163,62 @@ def create_tools_node(tools: Sequence[Any]) -> Any:
     # Create LangGraph's standard ToolNode
     base_tools_node = ToolNode(tools)
 
-    def tools_node_wrapper(state: AgentState) -> dict[str, Any]:
+    def tools_node_wrapper(state: AgentState, config: RunnableConfig) -> dict[str, Any]:
         """Execute tools and sync todo list state.
 
         Args:
             state: Current agent state
+            config: Run config, passed on so ToolNode honours settings such
+                as max_concurrency and callbacks
 
         Returns:
             Updated state with tool results and synced todo_list
         """
-        # Sync state to TodoStateManager before execution
-        try:
-            from alfredo.tools.handlers.todo import TodoStateManager
-
-            manager = TodoStateManager()
-            current_todo = state.get("todo_list")
-            manager.set_todo_list(current_todo)
-        except ImportError:
-            # Todo tools not available, skip sync
-            pass
+        _push_todo_list(state)
 
         # Execute tools using LangGraph's ToolNode
         # ToolNode is callable and returns state updates
-        result = base_tools_node.invoke(state)
+        return _pull_todo_list(base_tools_node.invoke(state, config))
 
-        # Sync TodoStateManager back to state after execution
-        try:
-            from alfredo.tools.handlers.todo import TodoStateManager
+    async def atools_node_wrapper(state: AgentState, config: RunnableConfig) -> dict[str, Any]:
+        """Async variant of tools_node_wrapper."""
+        _push_todo_list(state)
+        return _pull_todo_list(await base_tools_node.ainvoke(state, config))
 
-            manager = TodoStateManager()
-            updated_todo = manager.get_todo_list()
-            # Add todo_list to result if it's a dict
-            if isinstance(result, dict):
-                result["todo_list"] = updated_todo
-            else:
-                # If result is not a dict, create a dict with messages and todo_list
-                result = {"messages": result.get("messages", []), "todo_list": updated_todo}
-        except ImportError:
-            # Todo tools not available, skip sync
-            pass
+    return RunnableLambda(tools_node_wrapper, afunc=atools_node_wrapper, name="tools")
+
+
+def _push_todo_list(state: AgentState) -> None:
+    """Sync the state's todo list to TodoStateManager before tools run."""
+    try:
+        from alfredo.tools.handlers.todo import TodoStateManager
 
-        return result  # type: ignore[no-any-return]
+        manager = TodoStateManager()
+        current_todo = state.get("todo_list")
+        manager.set_todo_list(current_todo)
+    except ImportError:
+        # Todo tools not available, skip sync
+        pass
+
+
+def _pull_todo_list(result: Any) -> dict[str, Any]:
+    """Add TodoStateManager's todo list to the tools' state update."""
+    try:
+        from alfredo.tools.handlers.todo import TodoStateManager
+
+        manager = TodoStateManager()
+        updated_todo = manager.get_todo_list()
+        # Add todo_list to result if it's a dict
+        if isinstance(result, dict):
+            result["todo_list"] = updated_todo
+        else:
+            # If result is not a dict, create a dict with messages and todo_list
+            result = {"messages": result.get("messages", []), "todo_list": updated_todo}
+    except ImportError:
+        # Todo tools not available, skip sync
+        pass
 
-    return tools_node_wrapper
+    return result  # type: ignore[no-any-return]
 
 
 def format_execution_trace(messages: Sequence) -> str:  # noqa: C901
@@ -233,9 +257,7 @@ def format_execution_trace(messages: Sequence) -> str:  # noqa: C901
                         # Format args - show full values for verification
                         args_str = ", ".join([f"{k}={v!r}" for k, v in args.items()])
                         trace_lines.append(f"  Arguments: {args_str}")
-            elif (
-                content and not content.startswith("Plan created:") and not content.startswith("Creating improved plan")
-            ):
+            elif content and not content.startswith(("Plan created:", "Creating improved plan")):
                 # Agent thinking/reasoning (not tool calls)
                 step_num += 1
                 trace_lines.append(f"\n**Step {step_num}: Agent reasoning**")
@@ -254,7 +276,7 @@ def format_execution_trace(messages: Sequence) -> str:  # noqa: C901
         # Human messages (usually verification feedback)
         elif isinstance(msg, HumanMessage):
             content = str(msg.content) if hasattr(msg, "content") else ""
-            if not content.startswith("Task:") and not content.startswith("Verification result:"):
+            if not content.startswith(("Task:", "Verification result:")):
                 step_num += 1
                 trace_lines.append(f"\n**Step {step_num}: User input**")
                 trace_lines.append(f"  {content}")
@@ -415,14 +437,11 @@ def extract_attempt_completion(state: AgentState) -> str:
             content = str(msg.content)
             if "[TASK_COMPLETE]" in content:
                 # Extract the result (everything after [TASK_COMPLETE]\n)
-                lines = content.split("\n", 1)
-                if len(lines) > 1:
-                    # Return everything after the marker, stripping "Final command executed:" if present
-                    result = lines[1]
-                    # If there's a "Final command executed:" line, keep everything before it
-                    if "\nFinal command executed:" in result:
-                        result = result.split("\nFinal command executed:")[0]
-                    return result.strip()
+                _, newline, result = content.partition("\n")
+                if newline:
+                    # Return everything after the marker, keeping only what precedes a
+                    # "Final command executed:" line if present
+                    return result.partition("\nFinal command executed:")[0].strip()
                 return ""
 
     return ""
@@ -115,9 +115,20 @@ def create_langchain_tool(
             # But we return error message for graceful handling
             return f"Error: {result.error}"
 
+    # Used by ainvoke(), so async agents can run tool calls concurrently
+    async def tool_coroutine(**kwargs: Any) -> str:
+        """Execute the Alfredo tool asynchronously."""
+        handler = handler_class(cwd=cwd)
+        result: ToolResult = await handler.execute_async(kwargs)
+
+        if result.success:
+            return result.output
+        return f"Error: {result.error}"
+
     # Create the LangChain tool
     lc_tool = StructuredTool.from_function(
         func=tool_func,
+        coroutine=tool_coroutine,
         name=spec.id,
         description=spec.description,
         args_schema=args_schema,
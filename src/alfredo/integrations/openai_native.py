@@ -5,6 +5,7 @@ Converts Alfredo tools to OpenAI's native function calling format.
 """
 
 import json
+from collections.abc import Sequence
 from typing import Any, Optional
 
 from alfredo.tools.base import ToolResult
@@ -113,6 +114,7 @@ def get_all_tools_openai_format(
     )
 
     # Get specs
+    filtered_specs: Sequence[ToolSpec]
     if tool_ids:
         specs = [registry.get_spec(tool_id, model_family) for tool_id in tool_ids]
         # Filter out None values
@@ -1,9 +1,10 @@
 """Prompt builder for generating system prompts with tool definitions."""
 
+from collections.abc import Sequence
 from typing import Any, Optional
 
 from alfredo.tools.registry import registry
-from alfredo.tools.specs import ModelFamily
+from alfredo.tools.specs import ModelFamily, ToolSpec
 
 
 class PromptBuilder:
@@ -72,6 +73,7 @@ IMPORTANT RULES:
             Formatted tools section
         """
         # Get tool specs
+        specs: Sequence[ToolSpec]
         if tool_ids:
             all_specs = [registry.get_spec(tool_id, self.model_family) for tool_id in tool_ids]
             specs = [s for s in all_specs if s is not None]  # Filter out None values
@@ -1,5 +1,7 @@
 """Base classes and utilities for tool handlers."""
 
+import asyncio
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
@@ -54,9 +56,13 @@ class BaseToolHandler(ABC):
     """Base class for all tool handlers.
 
     Tool handlers implement the actual execution logic for tools.
-    Subclasses must implement the execute() method.
+    Subclasses must implement the execute() method. Built-in handlers
+    declare __slots__ so their instances carry no __dict__; subclasses that
+    do not declare any still work as usual.
     """
 
+    __slots__ = ("cwd",)
+
     def __init__(self, cwd: Optional[str] = None) -> None:
         """Initialize the tool handler.
 
@@ -83,6 +89,20 @@ class BaseToolHandler(ABC):
         """
         pass
 
+    async def execute_async(self, params: dict[str, Any]) -> ToolResult:
+        """Execute the tool without blocking the event loop.
+
+        By default this runs execute() in a worker thread, so independent
+        tool calls can overlap. Handlers with native async I/O override it.
+
+        Args:
+            params: Dictionary of parameter values
+
+        Returns:
+            ToolResult with the execution result
+        """
+        return await asyncio.to_thread(self.execute, params)
+
     def validate_required_param(self, params: dict[str, Any], param_name: str) -> None:
         """Validate that a required parameter is present.
 
@@ -136,6 +156,12 @@ class BaseToolHandler(ABC):
         Returns:
             Relative path string
         """
+        # Paths under cwd are usually spelled with it as a prefix; slicing the
+        # string avoids building intermediate Path objects for every entry
+        path_str = str(path)
+        prefix = f"{self.cwd}{os.sep}"
+        if path_str.startswith(prefix):
+            return path_str[len(prefix) :]
         try:
             return str(path.relative_to(self.cwd))
         except ValueError:
@@ -149,6 +175,8 @@ class AsyncToolHandler(BaseToolHandler):
     inherit from this class instead and implement execute_async().
     """
 
+    __slots__ = ()
+
     @abstractmethod
     async def execute_async(self, params: dict[str, Any]) -> ToolResult:
         """Execute the tool asynchronously.
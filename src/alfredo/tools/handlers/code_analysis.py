@@ -88,6 +88,8 @@ _initialize_languages()
 class ListCodeDefinitionNamesHandler(BaseToolHandler):
     """Handler for listing code definition names in source files."""
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "list_code_definition_names"
@@ -177,38 +179,35 @@ class ListCodeDefinitionNamesHandler(BaseToolHandler):
             parser = Parser(language)
             tree = parser.parse(source_code)
 
-            # Extract definitions by walking the tree
-            definitions = self._find_definitions(tree.root_node, node_types)
+            # Extract definitions by walking the tree. The walk is depth-first in
+            # source order, so the dict keys are already sorted by line number and
+            # duplicates collapse on insertion.
+            definitions: dict[tuple[str, int], None] = {}
+            self._find_definitions(tree.root_node, node_types, definitions)
 
-            return sorted(set(definitions), key=lambda x: x[1])  # Sort by line number, remove duplicates
+            return list(definitions)
 
         except Exception:
             return []
 
-    def _find_definitions(self, node: Any, node_types: list[str]) -> list[tuple[str, int]]:
+    def _find_definitions(self, node: Any, node_types: list[str], definitions: dict[tuple[str, int], None]) -> None:
         """Recursively find definition nodes in the syntax tree.
 
         Args:
             node: Current tree node
             node_types: List of node types to look for
-
-        Returns:
-            List of (definition_name, line_number) tuples
+            definitions: Ordered dict of (definition_name, line_number) keys to add to
         """
-        definitions = []
-
         if node.type in node_types:
             # Find the name of this definition
             name = self._extract_name(node)
             if name:
                 line_num = node.start_point[0] + 1  # Convert to 1-indexed
-                definitions.append((name, line_num))
+                definitions[(name, line_num)] = None
 
         # Recursively search children
         for child in node.children:
-            definitions.extend(self._find_definitions(child, node_types))
-
-        return definitions
+            self._find_definitions(child, node_types, definitions)
 
     def _extract_name(self, node: Any) -> str | None:
         """Extract the name from a definition node.
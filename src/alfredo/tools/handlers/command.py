@@ -11,6 +11,8 @@ from alfredo.tools.specs import ModelFamily, ToolParameter, ToolSpec
 class ExecuteCommandHandler(BaseToolHandler):
     """Handler for executing shell commands."""
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "execute_command"
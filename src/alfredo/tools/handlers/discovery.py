@@ -1,17 +1,391 @@
 """File discovery tool handlers: list files and search content."""
 
+import io
+import os
 import re
-from pathlib import Path
-from typing import Any
+import stat
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Any, BinaryIO, ClassVar
 
 from alfredo.tools.base import BaseToolHandler, ToolResult, ToolValidationError
 from alfredo.tools.registry import registry
 from alfredo.tools.specs import ModelFamily, ToolParameter, ToolSpec
 
+# Directories that list_files and search_files do not descend into: VCS metadata,
+# dependency trees, virtualenvs and tool caches
+DEFAULT_SKIP_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+})
+
+# File suffixes search_files treats as binary without opening the file: images,
+# archives, compiled objects and media
+DEFAULT_BINARY_SUFFIXES = frozenset({
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".ico",
+    ".pdf",
+    ".zip",
+    ".gz",
+    ".tar",
+    ".so",
+    ".dylib",
+    ".dll",
+    ".pyc",
+    ".wasm",
+    ".mp3",
+    ".mp4",
+})
+
+# Recursive listings fan out over threads only when the root has more subdirectories than this
+_PARALLEL_WALK_MIN_SUBDIRS = 4
+_PARALLEL_WALK_WORKERS = 8
+
+# search_files skips files larger than this by default
+DEFAULT_MAX_SEARCH_BYTES = 10 * 1024 * 1024
+
+# os.fwalk yields a descriptor per directory, so files can be stat'ed relative to it
+_HAVE_FWALK = hasattr(os, "fwalk") and os.stat in os.supports_dir_fd
+
+# Searching should not dirty inode access times; only available on Linux
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+# Leading bytes checked for NUL when deciding whether a file is binary
+_BINARY_SNIFF_BYTES = 8192
+
+# search_files reads files in blocks of about this many characters, cut at line boundaries
+_SEARCH_BLOCK_CHARS = 1 << 20
+
+# Pattern syntax that can match or look past a line break: literal control
+# characters, the \n, \s, \W and \D escapes, control-character, code-point and
+# numeric escapes (which may spell a newline or bound a range that spans one),
+# negated classes, lookarounds, the \A and \Z string anchors and the DOTALL flag
+_LINE_CROSSING_SYNTAX = re.compile(r"[\x00-\x1f]|\\[nsWDAZtvfrxuUN0-9]|\[\^|\(\?<?[=!]|\(\?[aiLmux-]*s")
+
+
+@lru_cache(maxsize=256)
+def _compile_search_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a search pattern.
+
+    Results are cached, since agents often repeat the same search.
+
+    Args:
+        pattern: Regular expression in Python syntax
+
+    Returns:
+        Compiled multiline pattern
+
+    Raises:
+        re.error: If the pattern is not a valid Python regex
+    """
+    return re.compile(pattern, re.MULTILINE)
+
+
+def _scandir_sorted(dir_path: str | Path) -> list[os.DirEntry]:
+    """Read a directory's entries sorted by name.
+
+    DirEntry caches the file type from the directory read and the first
+    stat() result, so listing an entry costs at most one extra syscall.
+    """
+    with os.scandir(dir_path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+def _format_entry(entry: os.DirEntry, rel_path: str) -> str:
+    """Format a directory entry for a listing.
+
+    The type comes from the directory read where the platform provides it,
+    and the size from DirEntry's cached stat, so an entry is stat'ed at most once.
+    """
+    if entry.is_dir():
+        return f"[DIR]  {rel_path}/"
+    return f"[FILE] {rel_path} ({entry.stat().st_size} bytes)"
+
+
+def _walk_entries(entries: list[os.DirEntry], rel_dir: str, skip_dirs: frozenset[str]) -> list[str]:
+    """List directory entries and everything below them, depth-first.
+
+    Uses an explicit stack of sorted scandir iterators. Symlinked directories,
+    directories named in skip_dirs and unreadable directories are listed but
+    not entered.
+
+    Args:
+        entries: Name-sorted entries of the starting directory
+        rel_dir: Display prefix for the starting directory
+        skip_dirs: Directory names whose contents are left out
+
+    Returns:
+        Formatted listing lines
+    """
+    items = []
+    stack = [(iter(entries), rel_dir)]
+
+    while stack:
+        pending, parent = stack[-1]
+        entry = next(pending, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        rel_path = os.path.join(parent, entry.name)
+        items.append(_format_entry(entry, rel_path))
+
+        if _should_descend(entry, skip_dirs):
+            try:
+                stack.append((iter(_scandir_sorted(entry.path)), rel_path))
+            except PermissionError:
+                continue
+
+    return items
+
+
+def _walk_directory(dir_path: str, rel_dir: str, skip_dirs: frozenset[str]) -> list[str]:
+    """List everything below a subdirectory (its own entry excluded)."""
+    try:
+        entries = _scandir_sorted(dir_path)
+    except PermissionError:
+        return []
+    return _walk_entries(entries, rel_dir, skip_dirs)
+
+
+def _should_descend(entry: os.DirEntry, skip_dirs: frozenset[str]) -> bool:
+    """Check whether a recursive listing should enter a directory entry."""
+    return entry.is_dir() and not entry.is_symlink() and entry.name not in skip_dirs
+
+
+def _walk_with_fds(dir_path: Path) -> Iterator[tuple[str, list[str], list[str], int | None]]:
+    """Walk a tree like os.walk, adding a descriptor for each directory when supported.
+
+    Yields:
+        Tuples of (root, dirs, files, dir_fd); dir_fd is None without os.fwalk.
+        Pruning dirs in place works as with os.walk.
+    """
+    if _HAVE_FWALK:
+        yield from os.fwalk(dir_path)
+    else:
+        for root, dirs, files in os.walk(dir_path):
+            yield root, dirs, files, None
+
+
+def _iter_search_files(
+    dir_path: Path, file_pattern: str, skip_dirs: frozenset[str], skip_suffixes: frozenset[str] = frozenset()
+) -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield files below a directory whose path matches a glob, in sorted order.
+
+    Matches what Path.rglob(file_pattern) would select, but prunes skip_dirs
+    without descending into them and does not follow directory symlinks.
+    Where the platform supports it, the walk holds each directory open and
+    stats its files relative to that descriptor instead of by full path.
+
+    Args:
+        dir_path: Directory to walk
+        file_pattern: Glob matched against file names, or against the trailing
+                      path components when it contains a separator
+        skip_dirs: Directory names to prune
+        skip_suffixes: Lowercase file suffixes to leave out before stat'ing
+
+    Yields:
+        Tuples of (path, stat result) for candidate entries (not yet checked
+        to be regular files); entries that vanish or cannot be stat'ed are left out
+    """
+    match_all = file_pattern == "*"
+    match_name = "/" not in file_pattern and os.sep not in file_pattern
+
+    for root, dirs, files, dir_fd in _walk_with_fds(dir_path):
+        dirs[:] = sorted(d for d in dirs if d not in skip_dirs)
+        root_path = Path(root)
+        rel_root = "" if match_all or match_name else os.path.relpath(root, dir_path)
+        for name in sorted(files):
+            if skip_suffixes and os.path.splitext(name)[1].lower() in skip_suffixes:
+                continue
+            if match_all or (
+                fnmatch(name, file_pattern) if match_name else PurePath(rel_root, name).match(file_pattern)
+            ):
+                file_path = root_path / name
+                try:
+                    st = os.stat(name, dir_fd=dir_fd) if dir_fd is not None else file_path.stat()
+                except OSError:
+                    continue
+                yield file_path, st
+
+
+def _open_for_scan(file_path: Path) -> BinaryIO:
+    """Open a file for one sequential read.
+
+    On Linux the file is opened with O_NOATIME where permitted, so searching
+    does not write access times back, and the kernel is told to read ahead.
+
+    Args:
+        file_path: File to open
+
+    Returns:
+        Buffered binary file object
+    """
+    flags = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+    try:
+        fd = os.open(file_path, flags | _O_NOATIME)
+    except PermissionError:
+        if not _O_NOATIME:
+            raise
+        fd = os.open(file_path, flags)  # O_NOATIME needs ownership of the file
+
+    if hasattr(os, "posix_fadvise"):
+        with suppress(OSError):  # Only a hint; some filesystems reject it
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    return os.fdopen(fd, "rb")
+
+
+def _search_file(file_path: Path, regex: re.Pattern[str]) -> list[tuple[Path, int, str]]:
+    """Search a single file for lines matching a regex.
+
+    The file is streamed in blocks cut at line boundaries, so memory use stays
+    bounded no matter how large the file is.
+
+    Args:
+        file_path: File to search
+        regex: Compiled multiline pattern from _compile_search_pattern
+
+    Returns:
+        List of (file_path, line_number, line_content) tuples
+    """
+    matches: list[tuple[Path, int, str]] = []
+    search_block = _search_block if _is_line_local(regex.pattern) else _search_lines
+    first_line = 1
+    tail = ""
+
+    try:
+        with _open_for_scan(file_path) as raw:
+            # Skip binary files: a NUL byte near the start, as grep and ripgrep check
+            if b"\0" in raw.read(_BINARY_SNIFF_BYTES):
+                return []
+            raw.seek(0)
+            with io.TextIOWrapper(raw, encoding="utf-8") as f:
+                while chunk := f.read(_SEARCH_BLOCK_CHARS):
+                    block = tail + chunk
+                    cut = block.rfind("\n") + 1
+                    if cut == 0:
+                        tail = block  # No complete line yet
+                        continue
+                    tail = block[cut:]
+                    matches.extend(search_block(block[:cut], regex, file_path, first_line))
+                    first_line += block.count("\n", 0, cut)
+    except (UnicodeDecodeError, PermissionError):
+        return []  # Not UTF-8 text after all, or unreadable
+
+    if tail:
+        matches.extend(search_block(tail, regex, file_path, first_line))
+
+    return matches
+
+
+def _search_block(
+    content: str, regex: re.Pattern[str], file_path: Path, first_line: int
+) -> list[tuple[Path, int, str]]:
+    """Search a block of whole lines for lines matching a regex.
+
+    The pattern is run over the whole block rather than line by line, so only
+    matching lines are ever sliced out. Only valid for patterns that pass
+    _is_line_local: those can neither match nor look past a line break, so
+    every match lies within one line and the results are identical to a
+    per-line search. After a match the search resumes at the next line.
+
+    Args:
+        content: Block of text starting at a line boundary
+        regex: Compiled multiline pattern
+        file_path: File the block was read from
+        first_line: Line number of the first line in the block
+
+    Returns:
+        List of (file_path, line_number, line_content) tuples
+    """
+    matches: list[tuple[Path, int, str]] = []
+    size = len(content)
+    pos = 0  # Start of the first line not yet reported
+    line_num = first_line
+    counted_to = 0
+
+    # Stop once past the last line: searching at the end of a block without a
+    # trailing newline would otherwise report an empty match on it forever
+    while pos < size and (match := regex.search(content, pos)) is not None:
+        start = match.start()
+        line_start = content.rfind("\n", 0, start) + 1
+        if line_start == size:
+            break  # Empty match after the trailing newline, not a real line
+        line_end = content.find("\n", start)
+        if line_end == -1:
+            line_end = size
+
+        line_num += content.count("\n", counted_to, line_start)
+        counted_to = line_start
+        matches.append((file_path, line_num, content[line_start:line_end]))
+        pos = line_end + 1
+
+    return matches
+
+
+def _search_lines(
+    content: str, regex: re.Pattern[str], file_path: Path, first_line: int
+) -> list[tuple[Path, int, str]]:
+    """Search a block of whole lines one line at a time.
+
+    Used for patterns that could see past a line break, such as lookarounds,
+    whitespace classes or string anchors, which then apply to each line alone.
+
+    Args:
+        content: Block of text starting at a line boundary
+        regex: Compiled multiline pattern
+        file_path: File the block was read from
+        first_line: Line number of the first line in the block
+
+    Returns:
+        List of (file_path, line_number, line_content) tuples
+    """
+    lines = content.split("\n")
+    if lines[-1] == "":
+        lines.pop()  # Nothing follows the trailing newline
+    return [(file_path, line_num, line) for line_num, line in enumerate(lines, first_line) if regex.search(line)]
+
+
+@lru_cache(maxsize=256)
+def _is_line_local(pattern: str) -> bool:
+    """Check whether a pattern can only ever match within a single line.
+
+    Conservative: any syntax that could match a newline or look past one
+    (see _LINE_CROSSING_SYNTAX) rules the pattern out.
+
+    Args:
+        pattern: Regular expression in Python syntax
+
+    Returns:
+        True if the pattern may be run over a whole block of lines
+    """
+    return _LINE_CROSSING_SYNTAX.search(pattern) is None
+
 
 class ListFilesHandler(BaseToolHandler):
     """Handler for listing directory contents."""
 
+    __slots__ = ()
+
+    # Directories listed but not entered by recursive listings
+    SKIP_DIRS: ClassVar[frozenset[str]] = DEFAULT_SKIP_DIRS
+
     @property
     def tool_id(self) -> str:
         return "list_files"
@@ -30,10 +404,12 @@ class ListFilesHandler(BaseToolHandler):
             dir_path = self.resolve_path(params["path"])
             recursive = params.get("recursive", "false").lower() == "true"
 
-            if not dir_path.exists():
+            try:
+                dir_stat = dir_path.stat()
+            except (FileNotFoundError, NotADirectoryError):
                 return ToolResult.err(f"Directory not found: {self.get_relative_path(dir_path)}")
 
-            if not dir_path.is_dir():
+            if not stat.S_ISDIR(dir_stat.st_mode):
                 return ToolResult.err(f"Path is not a directory: {self.get_relative_path(dir_path)}")
 
             # List files
@@ -43,8 +419,8 @@ class ListFilesHandler(BaseToolHandler):
                 if not items:
                     return ToolResult.ok(f"Directory is empty: {self.get_relative_path(dir_path)}")
 
-                output = "\n".join(items)
-                return ToolResult.ok(f"Contents of {self.get_relative_path(dir_path)}:\n\n{output}")
+                # Join the header in with the lines, so the listing is copied into a string once
+                return ToolResult.ok("\n".join([f"Contents of {self.get_relative_path(dir_path)}:\n", *items]))
 
             except Exception as e:
                 return ToolResult.err(f"Error listing directory: {e}")
@@ -56,32 +432,67 @@ class ListFilesHandler(BaseToolHandler):
 
     def _list_top_level(self, dir_path: Path) -> list[str]:
         """List only top-level contents."""
-        items = []
-        for item in sorted(dir_path.iterdir()):
-            rel_path = self.get_relative_path(item)
-            if item.is_dir():
-                items.append(f"[DIR]  {rel_path}/")
-            else:
-                size = item.stat().st_size
-                items.append(f"[FILE] {rel_path} ({size} bytes)")
-        return items
+        rel_dir = self._relative_dir(dir_path)
+        return [_format_entry(entry, os.path.join(rel_dir, entry.name)) for entry in _scandir_sorted(dir_path)]
 
     def _list_recursive(self, dir_path: Path) -> list[str]:
-        """List all contents recursively."""
+        """List all contents recursively.
+
+        Each directory's entries are listed in name order, with subdirectory
+        contents right after the subdirectory itself. Directories in SKIP_DIRS
+        are listed but not entered. When the root has many subdirectories,
+        their subtrees are walked concurrently; the merged output is the same
+        as a serial walk.
+        """
+        rel_dir = self._relative_dir(dir_path)
+        entries = _scandir_sorted(dir_path)
+        subdirs = [entry for entry in entries if _should_descend(entry, self.SKIP_DIRS)]
+
+        if len(subdirs) <= _PARALLEL_WALK_MIN_SUBDIRS:
+            return _walk_entries(entries, rel_dir, self.SKIP_DIRS)
+
         items = []
-        for item in sorted(dir_path.rglob("*")):
-            rel_path = self.get_relative_path(item)
-            if item.is_dir():
-                items.append(f"[DIR]  {rel_path}/")
-            else:
-                size = item.stat().st_size
-                items.append(f"[FILE] {rel_path} ({size} bytes)")
+        with ThreadPoolExecutor(max_workers=_PARALLEL_WALK_WORKERS) as executor:
+            subtrees = {
+                entry.name: executor.submit(
+                    _walk_directory, entry.path, os.path.join(rel_dir, entry.name), self.SKIP_DIRS
+                )
+                for entry in subdirs
+            }
+            for entry in entries:
+                items.append(_format_entry(entry, os.path.join(rel_dir, entry.name)))
+                if entry.name in subtrees:
+                    items.extend(subtrees[entry.name].result())
+
         return items
 
+    def _relative_dir(self, dir_path: Path) -> str:
+        """Get the prefix to join entry names onto for display."""
+        rel_dir = self.get_relative_path(dir_path)
+        return "" if rel_dir == "." else rel_dir
+
 
 class SearchFilesHandler(BaseToolHandler):
     """Handler for searching file contents with regex."""
 
+    __slots__ = ("max_file_bytes",)
+
+    # Directories never searched
+    SKIP_DIRS: ClassVar[frozenset[str]] = DEFAULT_SKIP_DIRS
+    # File suffixes never opened, since they are known binary formats
+    SKIP_SUFFIXES: ClassVar[frozenset[str]] = DEFAULT_BINARY_SUFFIXES
+
+    def __init__(self, cwd: str | None = None, max_file_bytes: int | None = DEFAULT_MAX_SEARCH_BYTES) -> None:
+        """Initialize the handler.
+
+        Args:
+            cwd: Current working directory
+            max_file_bytes: Files larger than this are skipped and reported as such.
+                           Pass None to search files of any size.
+        """
+        super().__init__(cwd)
+        self.max_file_bytes = max_file_bytes
+
     @property
     def tool_id(self) -> str:
         return "search_files"
@@ -103,28 +514,32 @@ class SearchFilesHandler(BaseToolHandler):
             pattern = params["regex"]
             file_pattern = params.get("file_pattern", "*")
 
-            if not dir_path.exists():
+            try:
+                dir_stat = dir_path.stat()
+            except (FileNotFoundError, NotADirectoryError):
                 return ToolResult.err(f"Directory not found: {self.get_relative_path(dir_path)}")
 
-            if not dir_path.is_dir():
+            if not stat.S_ISDIR(dir_stat.st_mode):
                 return ToolResult.err(f"Path is not a directory: {self.get_relative_path(dir_path)}")
 
             # Compile regex
             try:
-                regex = re.compile(pattern)
+                regex = _compile_search_pattern(pattern)
             except re.error as e:
                 return ToolResult.err(f"Invalid regex pattern: {e}")
 
             # Search files
             try:
-                matches = self._search_directory(dir_path, regex, file_pattern)
+                matches, skipped = self._search_directory(dir_path, regex, file_pattern)
 
                 if not matches:
-                    return ToolResult.ok(
-                        f"No matches found for pattern '{pattern}' in {self.get_relative_path(dir_path)}"
-                    )
+                    output = f"No matches found for pattern '{pattern}' in {self.get_relative_path(dir_path)}"
+                else:
+                    output = self._format_matches(matches)
+
+                if skipped:
+                    output += f"\n\nSkipped {skipped} file(s) larger than {self.max_file_bytes} bytes."
 
-                output = self._format_matches(matches)
                 return ToolResult.ok(output)
 
             except Exception as e:
@@ -135,30 +550,29 @@ class SearchFilesHandler(BaseToolHandler):
         except Exception as e:
             return ToolResult.err(f"Unexpected error: {e}")
 
-    def _search_directory(self, dir_path: Path, regex: re.Pattern, file_pattern: str) -> list[tuple[Path, int, str]]:
+    def _search_directory(
+        self, dir_path: Path, regex: re.Pattern[str], file_pattern: str
+    ) -> tuple[list[tuple[Path, int, str]], int]:
         """Search all matching files in directory.
 
+        Files are searched one after another in walk order, so the output is
+        deterministic.
+
         Returns:
-            List of (file_path, line_number, line_content) tuples
+            Tuple of (list of (file_path, line_number, line_content) tuples,
+            number of files skipped for exceeding max_file_bytes)
         """
-        matches = []
-
-        for file_path in dir_path.rglob(file_pattern):
-            if not file_path.is_file():
+        files = []
+        skipped = 0
+        for file_path, st in _iter_search_files(dir_path, file_pattern, self.SKIP_DIRS, self.SKIP_SUFFIXES):
+            if not stat.S_ISREG(st.st_mode):
                 continue
-
-            # Skip binary files (basic check)
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except (UnicodeDecodeError, PermissionError):
+            if self.max_file_bytes is not None and st.st_size > self.max_file_bytes:
+                skipped += 1
                 continue
+            files.append(file_path)
 
-            # Search line by line
-            for line_num, line in enumerate(content.splitlines(), start=1):
-                if regex.search(line):
-                    matches.append((file_path, line_num, line))
-
-        return matches
+        return [match for file_path in files for match in _search_file(file_path, regex)], skipped
 
     def _format_matches(self, matches: list[tuple[Path, int, str]]) -> str:
         """Format search results for display."""
@@ -166,13 +580,11 @@ class SearchFilesHandler(BaseToolHandler):
 
         current_file = None
         for file_path, line_num, line in matches:
-            rel_path = self.get_relative_path(file_path)
-
-            if rel_path != current_file:
+            if file_path != current_file:
                 if current_file is not None:
                     lines.append("")  # Blank line between files
-                lines.append(f"{rel_path}:")
-                current_file = rel_path
+                lines.append(f"{self.get_relative_path(file_path)}:")
+                current_file = file_path
 
             lines.append(f"  {line_num}: {line.rstrip()}")
 
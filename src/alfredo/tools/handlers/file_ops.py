@@ -1,16 +1,169 @@
 """File operation tool handlers: read, write, and edit files."""
 
+import mmap
+import os
 import re
+import stat
+import uuid
+from pathlib import Path
 from typing import Any
 
 from alfredo.tools.base import BaseToolHandler, ToolResult, ToolValidationError
 from alfredo.tools.registry import registry
 from alfredo.tools.specs import ModelFamily, ToolParameter, ToolSpec
 
+# read_file maps files larger than this when only some of their lines are wanted
+_MMAP_READ_THRESHOLD = 256 * 1024
+
+# A carriage return not followed by a newline; under universal newlines it
+# ends a line on its own, which the memory-mapped line counting does not handle
+_BARE_CR = re.compile(rb"\r(?!\n)")
+
+# Newlines are counted this many bytes (or characters) at a time when seeking to a line
+_LINE_SCAN_CHUNK = 1 << 16
+
+# SEARCH/REPLACE blocks: ------- SEARCH\n...content...\n=======\n...content...\n+++++++ REPLACE
+_DIFF_PATTERN_PRIMARY = re.compile(r"-{7,}\s*SEARCH\s*\n(.*?)\n={7,}\s*\n(.*?)\n\+{7,}\s*REPLACE", re.DOTALL)
+# Same blocks without the trailing REPLACE marker
+_DIFF_PATTERN_FALLBACK = re.compile(r"-{7,}\s*SEARCH\s*\n(.*?)\n={7,}\s*\n(.*?)(?=\n-{7,}\s*SEARCH|\Z)", re.DOTALL)
+
+
+def _encode_text(content: str) -> bytes:
+    """Encode text for writing as UTF-8, translating newlines as text-mode writes do."""
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    return content.encode("utf-8")
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """Write all of data to a file descriptor with os.write, bypassing Python's buffering."""
+    with memoryview(data) as view:
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+
+
+def _write_atomic(file_path: Path, content: str, mode: int | None = None) -> None:
+    """Write text to a file so readers see either the old or the new content.
+
+    The content goes to a temporary file in the same directory, which is then
+    renamed over the target. A failed write leaves the original untouched.
+    The rename creates a new inode, so use this only for new files or files
+    that pass _can_replace.
+
+    Args:
+        file_path: File to write
+        content: Text to write as UTF-8
+        mode: Permission bits to give the file; defaults to 0o666 less the umask
+    """
+    data = _encode_text(content)
+
+    tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666 if mode is None else mode)
+    try:
+        try:
+            _write_fd(fd, data)
+        finally:
+            os.close(fd)
+        if mode is not None:
+            os.chmod(tmp_path, mode)  # Not subject to the umask, unlike os.open
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_in_place(file_path: Path, content: str) -> None:
+    """Truncate and rewrite an existing file, keeping its inode.
+
+    Ownership, hard links, ACLs and extended attributes stay as they are, and
+    a file the caller may not write raises PermissionError.
+    """
+    data = _encode_text(content)
+    fd = os.open(file_path, os.O_WRONLY | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0))
+    try:
+        _write_fd(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _can_replace(file_path: Path, st: os.stat_result) -> bool:
+    """Check whether renaming a new file over an existing one is indistinguishable from rewriting it.
+
+    A rename would bypass the file's own write permission, split hard links,
+    and drop an owner, group, ACL or extended attributes the new file cannot
+    inherit, so any of those rules it out.
+    """
+    if st.st_nlink > 1 or not os.access(file_path, os.W_OK) or not os.access(file_path.parent, os.W_OK):
+        return False
+    if hasattr(os, "geteuid") and (st.st_uid != os.geteuid() or st.st_gid != os.getegid()):
+        return False
+    if hasattr(os, "listxattr"):
+        try:
+            return not os.listxattr(file_path)
+        except OSError:
+            pass  # Filesystem without extended attributes
+    return True
+
+
+def _index_after_newline(data: bytes, n: int) -> int:
+    """Return the index just past the n-th newline in data (n >= 1)."""
+    index = -1
+    for _ in range(n):
+        index = data.find(b"\n", index + 1)
+    return index + 1
+
+
+def _line_start(text: str, n: int, pos: int = 0) -> int:
+    """Return the index where the line n lines after the one at pos starts.
+
+    Whole chunks are skipped with str.count, so only the last chunk is
+    walked newline by newline. text must have at least n newlines after pos.
+    """
+    while n:
+        count = text.count("\n", pos, pos + _LINE_SCAN_CHUNK)
+        if count < n:
+            n -= count
+            pos += _LINE_SCAN_CHUNK
+            continue
+        for _ in range(n):
+            pos = text.find("\n", pos) + 1
+        break
+    return pos
+
+
+def _utf8_complete_length(data: bytes) -> int:
+    """Return the length of data without a trailing incomplete UTF-8 sequence.
+
+    Only the last few bytes are inspected: continuation bytes are skipped back
+    to the lead byte, whose high bits give the sequence length.
+    """
+    end = len(data)
+    for back in range(1, min(4, end) + 1):
+        byte = data[end - back]
+        if byte & 0xC0 != 0x80:  # ASCII or a lead byte
+            needed = 4 if byte >= 0xF0 else 3 if byte >= 0xE0 else 2 if byte >= 0xC0 else 1
+            return end - back if needed > back else end
+    return end
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes with universal newlines, as Path.read_text does.
+
+    Raises:
+        UnicodeDecodeError: If the bytes are not valid UTF-8
+    """
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
 
 class ReadFileHandler(BaseToolHandler):
     """Handler for reading file contents."""
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "read_file"
@@ -31,10 +184,12 @@ class ReadFileHandler(BaseToolHandler):
             self.validate_required_param(params, "path")
             file_path = self.resolve_path(params["path"])
 
-            if not file_path.exists():
+            try:
+                file_stat = file_path.stat()
+            except (FileNotFoundError, NotADirectoryError):
                 return ToolResult.err(f"File not found: {self.get_relative_path(file_path)}")
 
-            if not file_path.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 return ToolResult.err(f"Path is not a file: {self.get_relative_path(file_path)}")
 
             # Parse and validate parameters
@@ -44,18 +199,26 @@ class ReadFileHandler(BaseToolHandler):
             offset, limit, limit_bytes = result
 
             # Read file contents
+            size = file_stat.st_size
             try:
-                content = file_path.read_text(encoding="utf-8")
+                with open(file_path, "rb") as f:
+                    # Handle byte-based limit
+                    if limit_bytes is not None:
+                        return self._read_with_byte_limit(f.read(limit_bytes), limit_bytes, size)
 
-                # Handle byte-based limit
-                if limit_bytes is not None:
-                    return self._read_with_byte_limit(content, limit_bytes)
+                    # Large files: map them and decode only the requested lines,
+                    # unless bare carriage returns also end lines in them
+                    if size > _MMAP_READ_THRESHOLD and (offset or limit):
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            if _BARE_CR.search(mm) is None:
+                                return self._read_mapped_lines(mm, offset, limit, file_path)
+
+                    content = _decode_text(f.read())
 
                 # Handle line-based limit
                 return self._read_with_line_limit(content, offset, limit, file_path)
 
             except UnicodeDecodeError:
-                size = file_path.stat().st_size
                 return ToolResult.err(f"File appears to be binary (size: {size} bytes). Cannot read as text.")
 
         except ToolValidationError as e:
@@ -124,32 +287,76 @@ class ReadFileHandler(BaseToolHandler):
                 return ToolResult.err(f"{name.capitalize()} must be positive")
             return parsed
 
-    def _read_with_byte_limit(self, content: str, limit_bytes: int) -> ToolResult:
+    def _read_with_byte_limit(self, byte_content: bytes, limit_bytes: int, total_size: int) -> ToolResult:
         """Read file with byte limit.
 
+        Only the returned prefix is read and decoded; the rest of the file is
+        never loaded.
+
         Args:
-            content: Full file content
+            byte_content: Up to limit_bytes bytes from the start of the file
             limit_bytes: Maximum bytes to read
+            total_size: Size of the whole file in bytes
 
         Returns:
             ToolResult with limited content
-        """
-        total_size = len(content.encode("utf-8"))
 
+        Raises:
+            UnicodeDecodeError: If the returned bytes are not valid UTF-8
+        """
         if limit_bytes >= total_size:
-            return ToolResult.ok(content)
+            return ToolResult.ok(_decode_text(byte_content))
 
-        # Truncate at byte boundary, being careful with UTF-8
-        byte_content = content.encode("utf-8")[:limit_bytes]
-        try:
-            result_content = byte_content.decode("utf-8")
-        except UnicodeDecodeError:
-            # Truncation split a multi-byte character
-            result_content = byte_content[:-1].decode("utf-8", errors="ignore")
+        # Truncate at byte boundary, dropping a multi-byte character the limit split
+        byte_content = byte_content[: _utf8_complete_length(byte_content)]
+        result_content = _decode_text(byte_content)
 
         # Add metadata
-        actual_bytes = len(result_content.encode("utf-8"))
-        metadata = f"[Showing first {actual_bytes} bytes of {total_size} total bytes]\n\n"
+        metadata = f"[Showing first {len(byte_content)} bytes of {total_size} total bytes]\n\n"
+        return ToolResult.ok(metadata + result_content)
+
+    def _read_mapped_lines(self, mm: mmap.mmap, offset: int, limit: int | None, file_path: Path) -> ToolResult:
+        """Read a range of lines from a memory-mapped file.
+
+        Newlines are counted in fixed-size chunks, so neither the whole file
+        nor a list of its lines is ever built; only the selected range is decoded.
+
+        Args:
+            mm: Read-only map of the whole file
+            offset: Line offset (0-indexed)
+            limit: Maximum lines to read
+            file_path: Path object for error messages
+
+        Returns:
+            ToolResult with limited content
+        """
+        size = len(mm)
+        end_line = (offset + limit) if limit else None
+        start = 0 if offset == 0 else None
+        end = None
+        newlines = 0
+
+        for pos in range(0, size, _LINE_SCAN_CHUNK):
+            chunk = mm[pos : pos + _LINE_SCAN_CHUNK]
+            count = chunk.count(b"\n")
+            if start is None and newlines + count >= offset:
+                start = pos + _index_after_newline(chunk, offset - newlines)
+            if end is None and end_line is not None and newlines + count >= end_line:
+                end = pos + _index_after_newline(chunk, end_line - newlines)
+            newlines += count
+
+        total_lines = newlines + (1 if size and mm[size - 1] != ord("\n") else 0)
+
+        # Validate offset
+        if start is None or offset >= total_lines:
+            return ToolResult.err(
+                f"Offset {offset} exceeds total lines ({total_lines}) in file: {self.get_relative_path(file_path)}"
+            )
+
+        actual_end = min(end_line, total_lines) if end_line else total_lines
+        result_content = _decode_text(mm[start : size if end is None else end])
+
+        metadata = f"[Showing lines {offset + 1}-{actual_end} of {total_lines} total lines]\n\n"
         return ToolResult.ok(metadata + result_content)
 
     def _read_with_line_limit(self, content: str, offset: int, limit: int | None, file_path: Any) -> ToolResult:
@@ -164,8 +371,7 @@ class ReadFileHandler(BaseToolHandler):
         Returns:
             ToolResult with limited content
         """
-        lines = content.splitlines(keepends=True)
-        total_lines = len(lines)
+        total_lines = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
 
         # Validate offset
         if offset >= total_lines:
@@ -175,11 +381,12 @@ class ReadFileHandler(BaseToolHandler):
 
         # Calculate line range
         end_line = (offset + limit) if limit else total_lines
-        selected_lines = lines[offset:end_line]
         actual_end = min(end_line, total_lines)
 
-        # Reconstruct content
-        result_content = "".join(selected_lines)
+        # Slice the range out directly instead of splitting every line
+        start = _line_start(content, offset)
+        end = len(content) if actual_end == total_lines else _line_start(content, actual_end - offset, start)
+        result_content = content[start:end]
 
         # Add metadata if partial read
         if offset > 0 or limit is not None:
@@ -192,6 +399,8 @@ class ReadFileHandler(BaseToolHandler):
 class WriteFileHandler(BaseToolHandler):
     """Handler for writing/creating files."""
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "write_to_file"
@@ -212,14 +421,25 @@ class WriteFileHandler(BaseToolHandler):
             file_path = self.resolve_path(params["path"])
             content = params["content"]
 
-            # Create parent directories if needed
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write through symlinks, including dangling ones, rather than replacing the link
+            target = file_path.resolve() if file_path.is_symlink() else file_path
 
-            # Write the file
-            file_path.write_text(content, encoding="utf-8")
+            try:
+                existing = target.stat()
+            except FileNotFoundError:
+                existing = None
+
+            if existing is None:
+                # Create parent directories if needed
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _write_atomic(target, content)
+            elif _can_replace(target, existing):
+                _write_atomic(target, content, stat.S_IMODE(existing.st_mode))
+            else:
+                _write_in_place(target, content)
 
             rel_path = self.get_relative_path(file_path)
-            action = "Created" if not file_path.exists() else "Updated"
+            action = "Created" if existing is None else "Updated"
             return ToolResult.ok(f"{action} file: {rel_path}")
 
         except ToolValidationError as e:
@@ -231,6 +451,8 @@ class WriteFileHandler(BaseToolHandler):
 class ReplaceInFileHandler(BaseToolHandler):
     """Handler for applying search/replace diffs to files."""
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "replace_in_file"
@@ -287,6 +509,9 @@ class ReplaceInFileHandler(BaseToolHandler):
         [text to replace with]
         +++++++ REPLACE
 
+        Blocks must appear in the order their search text occurs in the file;
+        each replaces the first occurrence after the previous block.
+
         Args:
             content: Original file content
             diff: Diff string with SEARCH/REPLACE blocks
@@ -304,17 +529,27 @@ class ReplaceInFileHandler(BaseToolHandler):
             msg = "No valid SEARCH/REPLACE blocks found in diff"
             raise ValueError(msg)
 
-        # Apply each block in order
-        result = content
+        # Locate each block after the previous one and stitch the result together in one pass
+        parts = []
+        cursor = 0
         for i, (search_text, replace_text) in enumerate(blocks):
-            if search_text not in result:
-                msg = f"Block {i + 1}: Search text not found in file:\n{search_text}"
+            index = content.find(search_text, cursor)
+            if index == -1:
+                if search_text in content:
+                    msg = (
+                        f"Block {i + 1}: Search text not found after the previous block "
+                        f"(list blocks in the order they appear in the file):\n{search_text}"
+                    )
+                else:
+                    msg = f"Block {i + 1}: Search text not found in file:\n{search_text}"
                 raise ValueError(msg)
 
-            # Replace only the first occurrence
-            result = result.replace(search_text, replace_text, 1)
+            parts.append(content[cursor:index])
+            parts.append(replace_text)
+            cursor = index + len(search_text)
 
-        return result
+        parts.append(content[cursor:])
+        return "".join(parts)
 
     def _parse_diff_blocks(self, diff: str) -> list[tuple[str, str]]:
         """Parse SEARCH/REPLACE blocks from diff string.
@@ -325,16 +560,11 @@ class ReplaceInFileHandler(BaseToolHandler):
         Returns:
             List of (search_text, replace_text) tuples
         """
-        # Pattern to match SEARCH/REPLACE blocks
-        # Looking for: ------- SEARCH\n...content...\n=======\n...content...\n+++++++ REPLACE
-        pattern = r"-{7,}\s*SEARCH\s*\n(.*?)\n={7,}\s*\n(.*?)\n\+{7,}\s*REPLACE"
-
-        matches = re.findall(pattern, diff, re.DOTALL)
+        matches = _DIFF_PATTERN_PRIMARY.findall(diff)
 
         if not matches:
             # Try a simpler pattern without the trailing markers
-            pattern = r"-{7,}\s*SEARCH\s*\n(.*?)\n={7,}\s*\n(.*?)(?=\n-{7,}\s*SEARCH|\Z)"
-            matches = re.findall(pattern, diff, re.DOTALL)
+            matches = _DIFF_PATTERN_FALLBACK.findall(diff)
 
         return [(search.rstrip(), replace.rstrip()) for search, replace in matches]
 
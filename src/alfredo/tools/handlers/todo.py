@@ -1,7 +1,6 @@
 """Todo list tool handlers: track task progress with a sequential checklist."""
 
-import threading
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional
 
 from alfredo.tools.base import BaseToolHandler, ToolResult, ToolValidationError
 from alfredo.tools.registry import registry
@@ -12,26 +11,19 @@ class TodoStateManager:
     """Singleton manager for todo list state.
 
     This provides a simple in-memory storage for the todo list that can be
-    accessed by both the handlers and the graph nodes.
+    accessed by both the handlers and the graph nodes. The single instance
+    is created when this module is imported, so TodoStateManager() just
+    returns it without locking or re-initializing.
     """
 
-    _instance: Optional["TodoStateManager"] = None
-    _lock = threading.Lock()
+    __slots__ = ("_todo_list",)
+
+    _instance: ClassVar["TodoStateManager"]
+    _todo_list: Optional[str]
 
     def __new__(cls) -> "TodoStateManager":
-        """Create or return the singleton instance."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self) -> None:
-        """Initialize the manager if not already initialized."""
-        if not getattr(self, "_initialized", False):
-            self._todo_list: Optional[str] = None
-            self._initialized: bool = True
+        """Return the singleton instance."""
+        return TodoStateManager._instance
 
     def get_todo_list(self) -> Optional[str]:
         """Get the current todo list."""
@@ -46,6 +38,10 @@ class TodoStateManager:
         self._todo_list = None
 
 
+TodoStateManager._instance = object.__new__(TodoStateManager)
+TodoStateManager._instance.clear()
+
+
 class WriteTodoListHandler(BaseToolHandler):
     """Handler for writing/updating the todo list.
 
@@ -53,6 +49,8 @@ class WriteTodoListHandler(BaseToolHandler):
     for tracking task progress.
     """
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "write_todo_list"
@@ -88,6 +86,8 @@ class ReadTodoListHandler(BaseToolHandler):
     This tool allows the agent to check the current state of the todo checklist.
     """
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "read_todo_list"
@@ -1,21 +1,78 @@
 """Vision tool handlers: analyze images with vision models."""
 
+import asyncio
 import base64
-import mimetypes
 import os
+import stat
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, ClassVar
 
 from alfredo.tools.base import BaseToolHandler, ToolResult, ToolValidationError
 from alfredo.tools.registry import registry
 from alfredo.tools.specs import ModelFamily, ToolParameter, ToolSpec
 
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None  # type: ignore[assignment,unused-ignore]
+
+# pybase64 uses a SIMD codec where the CPU supports it; its output is identical
+_b64encode = pybase64.b64encode if pybase64 is not None else base64.b64encode
+
+# Images are base64-encoded this many bytes at a time; a multiple of 3, so
+# chunks encode without padding and concatenate into one valid encoding
+_ENCODE_CHUNK_BYTES = 57 * 1024
+
+# Images larger than this are encoded afresh on every request instead of
+# being cached; with at most _IMAGE_CACHE_SIZE entries, the cache then holds
+# under 32 MiB of image data (about 43 MiB once base64-encoded)
+_MAX_CACHED_IMAGE_BYTES = 4 * 1024 * 1024
+_IMAGE_CACHE_SIZE = 8
+
+# Upper bound on concurrent model requests made by execute_batch()
+_MAX_BATCH_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model_name: str) -> Any:
+    """Return the chat model for model_name, creating it on first use.
+
+    Building a model re-reads provider settings and sets up a new HTTP
+    client, so models are kept and reused; this also keeps the client's
+    connections to the provider alive between analyses.
+    """
+    from langchain.chat_models import init_chat_model
+
+    return init_chat_model(model_name)
+
+
+def _content_text(content: Any) -> str:
+    """Return a model response's content as text."""
+    return content if isinstance(content, str) else str(content)
+
 
 class AnalyzeImageHandler(BaseToolHandler):
     """Handler for analyzing images with vision models."""
 
+    __slots__ = ("model_name",)
+
     # Supported image formats
     SUPPORTED_FORMATS: ClassVar[set[str]] = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+    _SUPPORTED_FORMATS_TEXT: ClassVar[str] = ", ".join(sorted(SUPPORTED_FORMATS))
+
+    # MIME type for each supported format; a fixed table rather than the
+    # mimetypes module, whose answers vary by platform (e.g. .bmp)
+    _EXT_TO_MIME: ClassVar[Mapping[str, str]] = MappingProxyType({
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".png": "image/png",
+        ".gif": "image/gif",
+        ".webp": "image/webp",
+        ".bmp": "image/bmp",
+    })
 
     def __init__(self, cwd: str | Path | None = None, model_name: str | None = None):
         """Initialize the handler.
@@ -45,38 +102,44 @@ class AnalyzeImageHandler(BaseToolHandler):
             ToolResult with image analysis or error
         """
         try:
-            self.validate_required_param(params, "path")
-            image_path = self.resolve_path(params["path"])
-            prompt = params.get("prompt", "Describe this image in detail.")
-            model_name = params.get("model", self.model_name)
-
-            # Validate file exists
-            if not image_path.exists():
-                return ToolResult.err(f"Image file not found: {self.get_relative_path(image_path)}")
-
-            if not image_path.is_file():
-                return ToolResult.err(f"Path is not a file: {self.get_relative_path(image_path)}")
-
-            # Validate file format
-            file_ext = image_path.suffix.lower()
-            if file_ext not in self.SUPPORTED_FORMATS:
-                return ToolResult.err(
-                    f"Unsupported image format: {file_ext}. "
-                    f"Supported formats: {', '.join(sorted(self.SUPPORTED_FORMATS))}"
-                )
+            request = self._prepare_request(params)
+            if isinstance(request, ToolResult):
+                return request
+            image_url, prompt, model_name = request
 
-            # Read and encode image
+            # Analyze image with vision model
             try:
-                image_data = self._encode_image(image_path)
+                analysis = self._analyze_with_model(image_url, prompt, model_name)
+                return ToolResult.ok(analysis)
             except Exception as e:
-                return ToolResult.err(f"Failed to read image: {e}")
+                return ToolResult.err(f"Vision model analysis failed: {e}")
 
-            # Determine MIME type
-            mime_type = self._get_mime_type(image_path)
+        except ToolValidationError as e:
+            return ToolResult.err(str(e))
+        except Exception as e:
+            return ToolResult.err(f"Error analyzing image: {e}")
+
+    async def execute_async(self, params: dict[str, Any]) -> ToolResult:
+        """Analyze an image without blocking the event loop.
+
+        The image is loaded in a worker thread and the model is called with
+        ainvoke(), so several analyses can wait on the model at once.
+
+        Args:
+            params: Same as execute()
+
+        Returns:
+            ToolResult with image analysis or error
+        """
+        try:
+            request = await asyncio.to_thread(self._prepare_request, params)
+            if isinstance(request, ToolResult):
+                return request
+            image_url, prompt, model_name = request
 
             # Analyze image with vision model
             try:
-                analysis = self._analyze_with_model(image_data, mime_type, prompt, model_name)
+                analysis = await self._analyze_with_model_async(image_url, prompt, model_name)
                 return ToolResult.ok(analysis)
             except Exception as e:
                 return ToolResult.err(f"Vision model analysis failed: {e}")
@@ -86,19 +149,176 @@ class AnalyzeImageHandler(BaseToolHandler):
         except Exception as e:
             return ToolResult.err(f"Error analyzing image: {e}")
 
-    def _encode_image(self, image_path: Path) -> str:
+    def execute_batch(self, batch_params: list[dict[str, Any]]) -> list[ToolResult]:
+        """Analyze several images, sending the requests for each model as one batch.
+
+        The model requests run concurrently through LangChain's ``batch()``,
+        so N independent analyses take roughly the time of the slowest one
+        rather than the sum of all of them.
+
+        Args:
+            batch_params: One parameter dict per image, as accepted by execute()
+
+        Returns:
+            One ToolResult per entry in batch_params, in the same order
+        """
+        results: list[ToolResult | None] = [None] * len(batch_params)
+        pending: dict[str, list[tuple[int, Any]]] = {}
+
+        for i, params in enumerate(batch_params):
+            try:
+                request = self._prepare_request(params)
+            except ToolValidationError as e:
+                results[i] = ToolResult.err(str(e))
+                continue
+            except Exception as e:
+                results[i] = ToolResult.err(f"Error analyzing image: {e}")
+                continue
+            if isinstance(request, ToolResult):
+                results[i] = request
+                continue
+            image_url, prompt, model_name = request
+            pending.setdefault(model_name, []).append((i, self._build_message(image_url, prompt)))
+
+        for model_name, entries in pending.items():
+            try:
+                llm = self._init_model(model_name)
+                responses = llm.batch(
+                    [[message] for _, message in entries],
+                    config={"max_concurrency": _MAX_BATCH_CONCURRENCY},
+                    return_exceptions=True,
+                )
+            except Exception as e:
+                for i, _ in entries:
+                    results[i] = ToolResult.err(f"Vision model analysis failed: {e}")
+                continue
+
+            for (i, _), response in zip(entries, responses, strict=True):
+                if isinstance(response, Exception):
+                    results[i] = ToolResult.err(f"Vision model analysis failed: Model invocation failed: {response}")
+                else:
+                    results[i] = ToolResult.ok(_content_text(response.content))
+
+        return [result for result in results if result is not None]
+
+    def _prepare_request(self, params: dict[str, Any]) -> ToolResult | tuple[str, str, str]:
+        """Validate parameters and load the image for one analysis request.
+
+        Args:
+            params: Parameter dict as accepted by execute()
+
+        Returns:
+            Tuple of (image data URI, prompt, model name), or an
+            error ToolResult if the image cannot be used
+
+        Raises:
+            ToolValidationError: If the path parameter is missing
+        """
+        self.validate_required_param(params, "path")
+        image_path = self.resolve_path(params["path"])
+        prompt = params.get("prompt", "Describe this image in detail.")
+        model_name = params.get("model", self.model_name)
+
+        # Validate file exists
+        try:
+            image_stat = image_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return ToolResult.err(f"Image file not found: {self.get_relative_path(image_path)}")
+
+        if not stat.S_ISREG(image_stat.st_mode):
+            return ToolResult.err(f"Path is not a file: {self.get_relative_path(image_path)}")
+
+        # Validate file format
+        file_ext = image_path.suffix.lower()
+        if file_ext not in self.SUPPORTED_FORMATS:
+            return ToolResult.err(
+                f"Unsupported image format: {file_ext}. Supported formats: {self._SUPPORTED_FORMATS_TEXT}"
+            )
+
+        # Read and encode image, reusing the result while a small file is unchanged
+        try:
+            if image_stat.st_size <= _MAX_CACHED_IMAGE_BYTES:
+                image_url = self._load_image(str(image_path), image_stat.st_mtime_ns, image_stat.st_size)
+            else:
+                image_url = self._read_image(str(image_path), image_stat.st_size)
+        except Exception as e:
+            return ToolResult.err(f"Failed to read image: {e}")
+
+        return image_url, prompt, model_name
+
+    @classmethod
+    def clear_image_cache(cls) -> None:
+        """Forget all cached image encodings."""
+        cls._load_image.cache_clear()
+
+    @staticmethod
+    @lru_cache(maxsize=_IMAGE_CACHE_SIZE)
+    def _load_image(path: str, mtime_ns: int, size: int) -> str:
+        """Encode an image as a base64 data URI, caching the result.
+
+        Agents often ask several questions about the same image, so encodings
+        are kept for the most recently used files. The modification time and
+        size are part of the key, so an edited file is read again. The cache
+        is shared by all handler instances in the process; callers only pass
+        images of at most _MAX_CACHED_IMAGE_BYTES, which bounds its memory.
+
+        Args:
+            path: Absolute path to the image file
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+
+        Returns:
+            Data URI of the form ``data:<mime type>;base64,<image>``
+        """
+        return AnalyzeImageHandler._read_image(path, size)
+
+    @staticmethod
+    def _read_image(path: str, size: int) -> str:
+        """Encode an image as a base64 data URI without caching it.
+
+        Args:
+            path: Absolute path to the image file
+            size: File size in bytes
+
+        Returns:
+            Data URI of the form ``data:<mime type>;base64,<image>``
+        """
+        image_path = Path(path)
+        prefix = f"data:{AnalyzeImageHandler._get_mime_type(image_path)};base64,"
+        return AnalyzeImageHandler._encode_image(image_path, prefix, size)
+
+    @staticmethod
+    def _encode_image(image_path: Path, prefix: str = "", size: int | None = None) -> str:
         """Read and encode image as base64.
 
         Args:
             image_path: Path to image file
+            prefix: ASCII text to place before the encoding, e.g. a data URI header
+            size: File size from an earlier stat, to size the output buffer
+                without another one; the whole file is encoded regardless
 
         Returns:
-            Base64-encoded image string
+            Base64-encoded image string, preceded by prefix
         """
+        # Encode in chunks into a buffer sized for the whole output, so the raw
+        # image is never held in memory alongside its encoding, and the prefix
+        # needs no second image-sized string to be attached
+        head = prefix.encode("ascii")
         with open(image_path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-
-    def _get_mime_type(self, image_path: Path) -> str:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            encoded = bytearray(len(head) + 4 * ((size + 2) // 3))
+            encoded[: len(head)] = head
+            pos = len(head)
+            while chunk := f.read(_ENCODE_CHUNK_BYTES):
+                piece = _b64encode(chunk)
+                encoded[pos : pos + len(piece)] = piece
+                pos += len(piece)
+        del encoded[pos:]  # In case the file shrank; had it grown, the buffer was extended
+        return encoded.decode("ascii")
+
+    @staticmethod
+    def _get_mime_type(image_path: Path) -> str:
         """Determine MIME type for image.
 
         Args:
@@ -107,27 +327,13 @@ class AnalyzeImageHandler(BaseToolHandler):
         Returns:
             MIME type string
         """
-        mime_type, _ = mimetypes.guess_type(str(image_path))
-        if mime_type and mime_type.startswith("image/"):
-            return mime_type
-
-        # Fallback based on extension
-        ext_to_mime = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-            ".bmp": "image/bmp",
-        }
-        return ext_to_mime.get(image_path.suffix.lower(), "image/jpeg")
-
-    def _analyze_with_model(self, image_data: str, mime_type: str, prompt: str, model_name: str) -> str:
+        return AnalyzeImageHandler._EXT_TO_MIME.get(image_path.suffix.lower(), "image/jpeg")
+
+    def _analyze_with_model(self, image_url: str, prompt: str, model_name: str) -> str:
         """Send image to vision model for analysis.
 
         Args:
-            image_data: Base64-encoded image
-            mime_type: Image MIME type
+            image_url: Image as a base64 data URI
             prompt: User prompt/question
             model_name: Model to use
 
@@ -138,43 +344,96 @@ class AnalyzeImageHandler(BaseToolHandler):
             ImportError: If langchain not available
             Exception: If model call fails
         """
-        try:
-            from langchain_core.messages import HumanMessage
-        except ImportError as e:
-            msg = "LangChain is required for vision analysis. Install with: uv add langchain-core"
-            raise ImportError(msg) from e
+        message = self._build_message(image_url, prompt)
+        llm = self._init_model(model_name)
 
-        # Try to initialize the model
+        # Invoke model
         try:
-            from langchain.chat_models import init_chat_model
+            response = llm.invoke([message])
+        except Exception as e:
+            msg = f"Model invocation failed: {e}"
+            raise RuntimeError(msg) from e
+        else:
+            return _content_text(response.content)
+
+    async def _analyze_with_model_async(self, image_url: str, prompt: str, model_name: str) -> str:
+        """Send image to vision model for analysis with ainvoke().
 
-            llm = init_chat_model(model_name)
+        Args:
+            image_url: Image as a base64 data URI
+            prompt: User prompt/question
+            model_name: Model to use
+
+        Returns:
+            Model's analysis text
+
+        Raises:
+            ImportError: If langchain not available
+            Exception: If model call fails
+        """
+        message = self._build_message(image_url, prompt)
+        llm = self._init_model(model_name)
+
+        # Invoke model
+        try:
+            response = await llm.ainvoke([message])
         except Exception as e:
-            msg = (
-                f"Failed to initialize vision model '{model_name}'. "
-                f"Make sure you have the required API key set. Error: {e}"
-            )
+            msg = f"Model invocation failed: {e}"
             raise RuntimeError(msg) from e
+        else:
+            return _content_text(response.content)
+
+    @staticmethod
+    def _build_message(image_url: str, prompt: str) -> Any:
+        """Create the chat message carrying the prompt and the image.
+
+        Args:
+            image_url: Image as a base64 data URI
+            prompt: User prompt/question
+
+        Returns:
+            LangChain HumanMessage
+
+        Raises:
+            ImportError: If langchain not available
+        """
+        try:
+            from langchain_core.messages import HumanMessage
+        except ImportError as e:
+            msg = "LangChain is required for vision analysis. Install with: uv add langchain-core"
+            raise ImportError(msg) from e
 
-        # Create message with image content
-        message = HumanMessage(
+        return HumanMessage(
             content=[
                 {"type": "text", "text": prompt},
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:{mime_type};base64,{image_data}"},
+                    "image_url": {"url": image_url},
                 },
             ]
         )
 
-        # Invoke model
+    @staticmethod
+    def _init_model(model_name: str) -> Any:
+        """Initialize the chat model used for vision analysis.
+
+        Args:
+            model_name: Model to use
+
+        Returns:
+            LangChain chat model
+
+        Raises:
+            RuntimeError: If the model cannot be initialized
+        """
         try:
-            response = llm.invoke([message])
+            return _get_llm(model_name)
         except Exception as e:
-            msg = f"Model invocation failed: {e}"
+            msg = (
+                f"Failed to initialize vision model '{model_name}'. "
+                f"Make sure you have the required API key set. Error: {e}"
+            )
             raise RuntimeError(msg) from e
-        else:
-            return str(response.content)
 
 
 # Register the tool
@@ -1,25 +1,126 @@
 """Web-related tool handlers: fetch and process web content."""
 
-from typing import Any
-from urllib.parse import urlparse
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from http.cookiejar import DefaultCookiePolicy
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 try:
     import html2text
     import requests
-    from bs4 import BeautifulSoup
 except ImportError:
     requests = None  # type: ignore[assignment]
-    BeautifulSoup = None  # type: ignore[assignment,misc]
     html2text = None
 
+try:
+    from html_to_markdown import ConversionOptions, convert
+except ImportError:
+    convert = None  # type: ignore[assignment,unused-ignore]
+
 from alfredo.tools.base import BaseToolHandler, ToolResult, ToolValidationError
 from alfredo.tools.registry import registry
 from alfredo.tools.specs import ModelFamily, ToolParameter, ToolSpec
 
+# Whether the libraries web_fetch needs could be imported
+_WEB_READY = requests is not None and html2text is not None
+
+# An http(s) URL with a non-empty host; requests cannot fetch other schemes
+_URL_RE = re.compile(r"(https?)://[^/?#\s]+", re.IGNORECASE)
+
+# Connection pools per host and connections kept per pool by the shared session
+_POOL_SIZE = 16
+
+# One session for all fetches, so repeated requests to a host reuse its
+# TCP/TLS connection instead of opening a new one. Its cookie jar accepts no
+# cookies, so fetches stay as stateless as separate requests.get() calls and
+# no site's cookies leak into later fetches by other agents or tasks
+if requests is not None:
+    _SESSION = requests.Session()
+    _SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    _adapter = requests.adapters.HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE)
+    _SESSION.mount("https://", _adapter)
+    _SESSION.mount("http://", _adapter)
+
+# html-to-markdown converts pages in Rust, many times faster than html2text;
+# its options mirror the html2text settings in _html_to_markdown()
+_HTML_TO_MARKDOWN_OPTIONS = ConversionOptions(wrap=False, extract_metadata=False) if convert is not None else None
+
+# Response bodies larger than this are not downloaded in full
+_MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+
+# Bytes read from a response body at a time
+_READ_CHUNK_BYTES = 64 * 1024
+
+# Most URLs whose fetched content is kept for revalidation with a conditional GET
+_URL_CACHE_SIZE = 64
+
+# Outputs longer than this many characters are never cached, and the cached
+# outputs together are kept under the second limit, so the process-wide
+# cache holds at most a few tens of megabytes
+_MAX_CACHED_OUTPUT_CHARS = 1024 * 1024
+_URL_CACHE_MAX_CHARS = 16 * 1024 * 1024
+
+# url -> (ETag, Last-Modified, tool output) for responses that carried a
+# validator; the oldest entry is evicted first
+_URL_CACHE: OrderedDict[str, tuple[str | None, str | None, str]] = OrderedDict()
+_URL_CACHE_LOCK = threading.Lock()
+
+
+def _read_text(response: Any) -> str | None:
+    """Read a streamed response body as text.
+
+    Returns None as soon as the body turns out to exceed _MAX_RESPONSE_BYTES.
+    Like requests' Response.text, undecodable bytes are replaced.
+    """
+    content_length = response.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > _MAX_RESPONSE_BYTES:
+        return None
+
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=_READ_CHUNK_BYTES):
+        body += chunk
+        if len(body) > _MAX_RESPONSE_BYTES:
+            return None
+
+    try:
+        return body.decode(response.encoding or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset in the Content-Type header
+        return body.decode("utf-8", errors="replace")
+
+
+def _cache_response(url: str, response: Any, output: str) -> None:
+    """Remember output for url if the response can be revalidated later.
+
+    Outputs above _MAX_CACHED_OUTPUT_CHARS are not kept. The oldest entries
+    are evicted until the cache is within both _URL_CACHE_SIZE entries and
+    _URL_CACHE_MAX_CHARS characters.
+    """
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    with _URL_CACHE_LOCK:
+        _URL_CACHE.pop(url, None)
+        if (not etag and not last_modified) or len(output) > _MAX_CACHED_OUTPUT_CHARS:
+            return
+        _URL_CACHE[url] = (etag, last_modified, output)
+        cached_chars = sum(len(entry[2]) for entry in _URL_CACHE.values())
+        while len(_URL_CACHE) > _URL_CACHE_SIZE or cached_chars > _URL_CACHE_MAX_CHARS:
+            cached_chars -= len(_URL_CACHE.popitem(last=False)[1][2])
+
 
 class WebFetchHandler(BaseToolHandler):
     """Handler for fetching web content and converting to markdown."""
 
+    __slots__ = ()
+
+    # Headers sent with every request
+    _HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "User-Agent": "Mozilla/5.0 (compatible; AlfredoBot/1.0)",
+    })
+
     @property
     def tool_id(self) -> str:
         return "web_fetch"
@@ -38,34 +139,49 @@ class WebFetchHandler(BaseToolHandler):
             url = params["url"]
 
             # Check if required libraries are available
-            if not requests or not html2text:
-                return ToolResult.err(
-                    "Required libraries not available. Please install: requests, beautifulsoup4, html2text"
-                )
+            if not _WEB_READY:
+                return ToolResult.err("Required libraries not available. Please install: requests, html2text")
 
             # Validate URL format
-            try:
-                parsed = urlparse(url)
-                if not parsed.scheme or not parsed.netloc:
-                    return ToolResult.err(f"Invalid URL format: {url}")
-            except Exception:
+            match = _URL_RE.match(url) if isinstance(url, str) else None
+            if match is None:
                 return ToolResult.err(f"Invalid URL format: {url}")
 
             # Auto-upgrade HTTP to HTTPS
-            if parsed.scheme == "http":
-                url = url.replace("http://", "https://", 1)
+            if match.group(1).lower() == "http":
+                url = f"https{url[match.end(1) :]}"
+
+            # Revalidate a previously fetched copy instead of downloading it again
+            headers: Mapping[str, str] = self._HEADERS
+            cached = _URL_CACHE.get(url)
+            if cached is not None:
+                etag, last_modified, _ = cached
+                headers = dict(headers)
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
 
-            # Fetch URL content
+            # Fetch URL content, streaming the body so its size can be capped
             try:
-                response = requests.get(
+                response = _SESSION.get(
                     url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (compatible; AlfredoBot/1.0)",
-                    },
+                    headers=headers,
                     timeout=30,
                     allow_redirects=True,
+                    stream=True,
                 )
-                response.raise_for_status()
+                try:
+                    response.raise_for_status()
+
+                    # Not modified since the cached copy was fetched
+                    if response.status_code == 304 and cached is not None:
+                        return ToolResult.ok(cached[2])
+
+                    return self._render_response(response, url)
+                finally:
+                    # Return the connection to the pool even if the body was not read
+                    response.close()
             except requests.exceptions.Timeout:
                 return ToolResult.err(f"Request timed out after 30 seconds: {url}")
             except requests.exceptions.TooManyRedirects:
@@ -73,59 +189,80 @@ class WebFetchHandler(BaseToolHandler):
             except requests.exceptions.RequestException as e:
                 return ToolResult.err(f"Failed to fetch URL: {e}")
 
-            # Check content type
-            content_type = response.headers.get("content-type", "").lower()
-
-            # Handle non-HTML content
-            if "html" not in content_type:
-                if "text" in content_type or "json" in content_type or "xml" in content_type:
-                    # Return text content as-is
-                    return ToolResult.ok(response.text)
-                return ToolResult.err(
-                    f"URL returned non-text content (content-type: {content_type}). "
-                    f"Cannot process this type of content."
-                )
-
-            # Convert HTML to markdown
-            markdown_content = self._html_to_markdown(response.text, url)
-            return ToolResult.ok(markdown_content)
-
         except ToolValidationError as e:
             return ToolResult.err(str(e))
         except Exception as e:
             return ToolResult.err(f"Error fetching web content: {e}")
 
-    def _html_to_markdown(self, html_content: str, url: str) -> str:
+    def _render_response(self, response: Any, url: str) -> ToolResult:
+        """Turn a successful HTTP response into tool output and cache it.
+
+        Args:
+            response: Response returned by requests
+            url: URL that was fetched
+
+        Returns:
+            ToolResult with markdown or text content, or an error for
+            non-text content
+        """
+        # Check content type before downloading the body
+        content_type = response.headers.get("content-type", "").lower()
+        is_html = "html" in content_type
+        if not (is_html or "text" in content_type or "json" in content_type or "xml" in content_type):
+            return ToolResult.err(
+                f"URL returned non-text content (content-type: {content_type}). Cannot process this type of content."
+            )
+
+        text = _read_text(response)
+        if text is None:
+            return ToolResult.err(f"Response is larger than {_MAX_RESPONSE_BYTES // (1024 * 1024)} MiB: {url}")
+
+        # Convert HTML to markdown; return other text content as-is
+        output = self._html_to_markdown(text, url) if is_html else text
+
+        _cache_response(url, response, output)
+        return ToolResult.ok(output)
+
+    def _html_to_markdown(self, html_content: str, url: str, clean: bool = False) -> str:
         """Convert HTML content to markdown format.
 
+        Uses html-to-markdown when it is installed (the web-fast extra) and
+        html2text otherwise. Both leave out the contents of script and style
+        elements, so the HTML is parsed only once by default.
+
         Args:
             html_content: Raw HTML content
             url: Original URL (for context)
+            clean: Strip script and style elements with BeautifulSoup before
+                converting; slower, but can help with badly malformed HTML
 
         Returns:
             Markdown-formatted content
         """
-        # Use html2text to convert
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        h.ignore_images = False
-        h.ignore_emphasis = False
-        h.body_width = 0  # Don't wrap lines
-        h.single_line_break = True
-
-        # Clean HTML with BeautifulSoup first (optional, but helps with malformed HTML)
-        if BeautifulSoup is not None:
+        if clean:
             try:
+                # Imported here since only this optional pre-pass needs it
+                from bs4 import BeautifulSoup
+
                 soup = BeautifulSoup(html_content, "html.parser")
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
                     script.decompose()
                 html_content = str(soup)
             except Exception:  # noqa: S110
-                pass  # If parsing fails, use original HTML
+                pass  # If bs4 is unavailable or parsing fails, use original HTML
 
         # Convert to markdown
-        markdown = h.handle(html_content)
+        if convert is not None:
+            markdown = convert(html_content, _HTML_TO_MARKDOWN_OPTIONS).content
+        else:
+            h = html2text.HTML2Text()
+            h.ignore_links = False
+            h.ignore_images = False
+            h.ignore_emphasis = False
+            h.body_width = 0  # Don't wrap lines
+            h.single_line_break = True
+            markdown = h.handle(html_content)
 
         # Add URL reference at the top
         result = f"# Content from {url}\n\n{markdown}"
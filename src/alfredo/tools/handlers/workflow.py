@@ -14,6 +14,8 @@ class AskFollowupHandler(BaseToolHandler):
     more information to proceed with a task.
     """
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "ask_followup_question"
@@ -48,6 +50,8 @@ class AttemptCompletionHandler(BaseToolHandler):
     and provide a summary of what was accomplished.
     """
 
+    __slots__ = ()
+
     @property
     def tool_id(self) -> str:
         return "attempt_completion"
@@ -67,12 +71,9 @@ class AttemptCompletionHandler(BaseToolHandler):
             command = params.get("command")
 
             # Format completion message
-            output_parts = ["[TASK_COMPLETE]", result]
-
             if command:
-                output_parts.append(f"\nFinal command executed: {command}")
-
-            return ToolResult.ok("\n".join(output_parts))
+                return ToolResult.ok(f"[TASK_COMPLETE]\n{result}\n\nFinal command executed: {command}")
+            return ToolResult.ok(f"[TASK_COMPLETE]\n{result}")
 
         except Exception as e:
             return ToolResult.err(f"Unexpected error: {e}")
@@ -1,7 +1,7 @@
 """Tool registry for managing available tools and their variants."""
 
-import threading
-from typing import Optional
+from collections.abc import Sequence
+from typing import ClassVar, Optional
 
 from alfredo.tools.specs import ModelFamily, ToolSpec
 
@@ -11,27 +11,23 @@ class ToolRegistry:
 
     This class maintains a mapping of tools by model family and provides
     methods to register, retrieve, and query available tools. It uses a
-    singleton pattern to ensure a single global registry.
+    singleton pattern to ensure a single global registry. The instance is
+    created when this module is imported, so ToolRegistry() just returns it
+    without locking or re-initializing.
     """
 
-    _instance: Optional["ToolRegistry"] = None
-    _lock = threading.Lock()
+    _instance: ClassVar["ToolRegistry"]
+    _tools: dict[ModelFamily, dict[str, ToolSpec]]
+    # Flat views of _tools so get_spec() needs no membership tests
+    _flat: dict[tuple[ModelFamily, str], ToolSpec]
+    _generic_flat: dict[str, ToolSpec]
+    # get_specs_for_variant() results, dropped whenever a spec is registered
+    _specs_by_variant_cache: dict[ModelFamily, tuple[ToolSpec, ...]]
+    _handlers: dict[str, type]
 
     def __new__(cls) -> "ToolRegistry":
-        """Create or return the singleton instance."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self) -> None:
-        """Initialize the registry if not already initialized."""
-        if not getattr(self, "_initialized", False):
-            self._tools: dict[ModelFamily, dict[str, ToolSpec]] = {}
-            self._handlers: dict[str, type] = {}
-            self._initialized: bool = True
+        """Return the singleton instance."""
+        return ToolRegistry._instance
 
     def register_spec(self, spec: ToolSpec) -> None:
         """Register a tool specification.
@@ -43,6 +39,11 @@ class ToolRegistry:
             self._tools[spec.variant] = {}
 
         self._tools[spec.variant][spec.id] = spec
+        self._flat[spec.variant, spec.id] = spec
+        if spec.variant == ModelFamily.GENERIC:
+            self._generic_flat[spec.id] = spec
+        # A new spec can change the result for any variant that falls back to GENERIC
+        self._specs_by_variant_cache.clear()
 
     def register_handler(self, tool_id: str, handler_class: type) -> None:
         """Register a handler class for a tool.
@@ -63,35 +64,37 @@ class ToolRegistry:
         Returns:
             The tool specification if found, None otherwise
         """
-        # Try exact variant first
-        if variant in self._tools and tool_id in self._tools[variant]:
-            return self._tools[variant][tool_id]
+        # Try exact variant first, then fall back to GENERIC
+        spec = self._flat.get((variant, tool_id))
+        return spec if spec is not None else self._generic_flat.get(tool_id)
 
-        # Fallback to GENERIC
-        if ModelFamily.GENERIC in self._tools and tool_id in self._tools[ModelFamily.GENERIC]:
-            return self._tools[ModelFamily.GENERIC][tool_id]
-
-        return None
-
-    def get_specs_for_variant(self, variant: ModelFamily = ModelFamily.GENERIC) -> list[ToolSpec]:
+    def get_specs_for_variant(self, variant: ModelFamily = ModelFamily.GENERIC) -> Sequence[ToolSpec]:
         """Get all tool specifications for a specific variant.
 
         If no tools are registered for the variant, returns GENERIC tools.
+        The result is cached until the next registration, so it is shared
+        between callers and must not be modified.
 
         Args:
             variant: The model family variant
 
         Returns:
-            List of tool specifications
+            Sequence of tool specifications
         """
-        if variant in self._tools:
-            return list(self._tools[variant].values())
+        specs = self._specs_by_variant_cache.get(variant)
+        if specs is not None:
+            return specs
 
-        # Fallback to GENERIC
-        if ModelFamily.GENERIC in self._tools:
-            return list(self._tools[ModelFamily.GENERIC].values())
+        if variant in self._tools:
+            specs = tuple(self._tools[variant].values())
+        elif ModelFamily.GENERIC in self._tools:
+            # Fallback to GENERIC
+            specs = tuple(self._tools[ModelFamily.GENERIC].values())
+        else:
+            specs = ()
 
-        return []
+        self._specs_by_variant_cache[variant] = specs
+        return specs
 
     def get_handler(self, tool_id: str) -> Optional[type]:
         """Get the handler class for a tool.
@@ -117,9 +120,15 @@ class ToolRegistry:
 
     def clear(self) -> None:
         """Clear all registered tools and handlers (mainly for testing)."""
-        self._tools.clear()
-        self._handlers.clear()
+        self._tools = {}
+        self._flat = {}
+        self._generic_flat = {}
+        self._specs_by_variant_cache = {}
+        self._handlers = {}
+
 
+ToolRegistry._instance = object.__new__(ToolRegistry)
+ToolRegistry._instance.clear()
 
 # Global registry instance
 registry = ToolRegistry()
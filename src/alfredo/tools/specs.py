@@ -1,9 +1,14 @@
 """Tool specification system for defining tool metadata and parameters."""
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import attrgetter
 from typing import Any, Callable, Optional
 
+# Reads every ToolParameter field that ToolSpec.format_for_prompt() depends on
+_prompt_fields = attrgetter("name", "required", "instruction", "usage", "description", "context_requirements")
+
 
 class ModelFamily(str, Enum):
     """Model family identifiers for tool variants."""
@@ -15,7 +20,7 @@ class ModelFamily(str, Enum):
     NEXT_GEN = "next_gen"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolParameter:
     """Specification for a tool parameter.
 
@@ -38,7 +43,7 @@ class ToolParameter:
     context_requirements: Optional[Callable[[dict[str, Any]], bool]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolSpec:
     """Specification for an AI agent tool.
 
@@ -62,24 +67,54 @@ class ToolSpec:
     parameters: list[ToolParameter] = field(default_factory=list)
     instruction: Optional[str] = None
     context_requirements: Optional[Callable[[dict[str, Any]], bool]] = None
+    # (stamp, context_free, prompts): the stamp is a snapshot of every field
+    # the prompt is built from, context_free says whether no parameter has
+    # context requirements, and prompts maps the indices of the parameters
+    # shown (None when context_free) to the formatted text. Replaced as one
+    # tuple, so concurrent callers never see parts of two versions. Declared
+    # as a field so it gets a slot of its own
+    _prompt_cache: Optional[tuple[tuple[Any, ...], bool, dict[Optional[tuple[int, ...]], str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def format_for_prompt(self, context: Optional[dict[str, Any]] = None) -> str:
         """Format this tool spec as a prompt section.
 
+        The result is cached. The context only decides which parameters are
+        shown, so a cached prompt is reused for every context that selects
+        the same parameters, and always when no parameter has context
+        requirements.
+
         Args:
             context: Optional context dictionary for evaluating context requirements
 
         Returns:
             Formatted string suitable for inclusion in a system prompt
         """
-        if context is None:
-            context = {}
-
-        # Filter parameters based on context requirements
-        filtered_params = [
-            p for p in self.parameters if p.context_requirements is None or p.context_requirements(context)
-        ]
-
+        params = tuple(self.parameters)
+        stamp = (self.id, self.description, *map(_prompt_fields, params))
+        cache = self._prompt_cache
+        if cache is None or cache[0] != stamp:
+            cache = (stamp, all(p.context_requirements is None for p in params), {})
+            self._prompt_cache = cache
+        _, context_free, prompts = cache
+
+        key: Optional[tuple[int, ...]] = None
+        if not context_free:
+            if context is None:
+                context = {}
+            # Filter parameters based on context requirements
+            key = tuple(
+                i for i, p in enumerate(params) if p.context_requirements is None or p.context_requirements(context)
+            )
+
+        prompt = prompts.get(key)
+        if prompt is None:
+            prompt = prompts[key] = self._build_prompt(params if key is None else [params[i] for i in key])
+        return prompt
+
+    def _build_prompt(self, filtered_params: Sequence[ToolParameter]) -> str:
+        """Build the prompt section showing the given parameters."""
         # Build the prompt
         lines = [
             f"## {self.id}",
@@ -6,13 +6,17 @@ from typing import Any
 import pytest
 
 
-@pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_agent_get_system_prompts() -> None:
-    """Test that get_system_prompts returns all expected prompts."""
+@pytest.fixture(scope="module")
+def agent() -> Any:
+    """Build one Agent shared by the read-only tests in this module."""
     from alfredo import Agent
 
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
+    return Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
+
 
+@pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
+def test_agent_get_system_prompts(agent: Any) -> None:
+    """Test that get_system_prompts returns all expected prompts."""
     prompts = agent.get_system_prompts(
         task="Create a hello world script",
         plan="1. Create file\n2. Write code",
@@ -36,12 +40,8 @@ def test_agent_get_system_prompts() -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_agent_get_tool_descriptions() -> None:
+def test_agent_get_tool_descriptions(agent: Any) -> None:
     """Test that get_tool_descriptions returns tool information."""
-    from alfredo import Agent
-
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
-
     tool_descriptions = agent.get_tool_descriptions()
 
     # Should have multiple tools
@@ -74,12 +74,8 @@ def test_agent_get_tool_descriptions() -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_agent_has_todo_tools() -> None:
+def test_agent_has_todo_tools(agent: Any) -> None:
     """Test that todo tools are present by default."""
-    from alfredo import Agent
-
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
-
     # Check that todo tools are actually present
     tool_descriptions = agent.get_tool_descriptions()
     tool_names = [t["name"] for t in tool_descriptions]
@@ -91,12 +87,8 @@ def test_agent_has_todo_tools() -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_agent_display_tool_descriptions(capsys: Any) -> None:
+def test_agent_display_tool_descriptions(agent: Any, capsys: Any) -> None:
     """Test that display_tool_descriptions prints formatted output."""
-    from alfredo import Agent
-
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
-
     # Call display method (should print to stdout)
     agent.display_tool_descriptions()
 
@@ -115,12 +107,8 @@ def test_agent_display_tool_descriptions(capsys: Any) -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_agent_display_system_prompts(capsys: Any) -> None:
+def test_agent_display_system_prompts(agent: Any, capsys: Any) -> None:
     """Test that display_system_prompts prints formatted output."""
-    from alfredo import Agent
-
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
-
     # Call display method with example task
     agent.display_system_prompts(
         task="Create a test script",
@@ -147,12 +135,8 @@ def test_agent_display_system_prompts(capsys: Any) -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_tool_type_detection() -> None:
+def test_tool_type_detection(agent: Any) -> None:
     """Test that tool type detection works correctly."""
-    from alfredo import Agent
-
-    agent = Agent(cwd=".", model_name="gpt-4.1-mini", verbose=False)
-
     tool_descriptions = agent.get_tool_descriptions()
 
     # All default tools should be Alfredo tools
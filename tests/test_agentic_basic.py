@@ -103,6 +103,17 @@ def test_attempt_completion_tool() -> None:
     assert "Task completed successfully" in result
 
 
+def test_attempt_completion_output_format() -> None:
+    """Test the exact completion message that the graph nodes parse."""
+    from alfredo.tools.handlers.workflow import AttemptCompletionHandler
+
+    handler = AttemptCompletionHandler(cwd=".")
+    assert handler.execute({}).output == "[TASK_COMPLETE]\nTask completed successfully."
+    assert handler.execute({"result": "Done", "command": "pytest"}).output == (
+        "[TASK_COMPLETE]\nDone\n\nFinal command executed: pytest"
+    )
+
+
 def test_langgraph_imports() -> None:
     """Test that LangGraph imports work (required dependency)."""
     from langchain_core.messages import BaseMessage
@@ -1,34 +1,31 @@
 """Tests for the agentic graph structure."""
 
 import os
+from typing import Any
 
 import pytest
 
 
-@pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_create_agentic_graph() -> None:
-    """Test that the graph can be created without errors."""
+@pytest.fixture(scope="module")
+def agentic_graph() -> Any:
+    """Build one default graph shared by the read-only graph structure tests."""
     from alfredo.agentic import create_agentic_graph
 
     # Requires API key to initialize the model
-    graph = create_agentic_graph(
-        cwd=".",
-        model_name="gpt-4.1-mini",
-        max_context_tokens=100000,
-    )
-
-    assert graph is not None
+    return create_agentic_graph(cwd=".", model_name="gpt-4.1-mini", max_context_tokens=100000)
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_graph_has_expected_nodes() -> None:
-    """Test that the graph contains all expected nodes."""
-    from alfredo.agentic import create_agentic_graph
+def test_create_agentic_graph(agentic_graph: Any) -> None:
+    """Test that the graph can be created without errors."""
+    assert agentic_graph is not None
 
-    graph = create_agentic_graph(cwd=".")
 
+@pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
+def test_graph_has_expected_nodes(agentic_graph: Any) -> None:
+    """Test that the graph contains all expected nodes."""
     # Get the graph structure
-    nodes = graph.get_graph().nodes
+    nodes = agentic_graph.get_graph().nodes
 
     # Check that all expected nodes are present
     expected_nodes = {"planner", "agent", "tools", "verifier", "replan"}
@@ -40,14 +37,10 @@ def test_graph_has_expected_nodes() -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_graph_edges() -> None:
+def test_graph_edges(agentic_graph: Any) -> None:
     """Test that the graph has expected edge structure."""
-    from alfredo.agentic import create_agentic_graph
-
-    graph = create_agentic_graph(cwd=".")
-
     # Get the graph structure
-    graph_obj = graph.get_graph()
+    graph_obj = agentic_graph.get_graph()
 
     # Verify key edges exist
     # Note: edges are represented as (from_node, to_node) tuples
@@ -307,21 +300,13 @@ def test_graph_without_planning() -> None:
 
 
 @pytest.mark.skipif(not os.getenv("OPENAI_API_KEY"), reason="OPENAI_API_KEY not set")
-def test_graph_with_planning_has_all_nodes() -> None:
+def test_graph_with_planning_has_all_nodes(agentic_graph: Any) -> None:
     """Test that graph with planning enabled has all nodes."""
-    from alfredo.agentic import create_agentic_graph
-
-    # Create graph with planning enabled (default)
-    graph = create_agentic_graph(
-        cwd=".",
-        model_name="gpt-4.1-mini",
-        enable_planning=True,
-    )
-
-    assert graph is not None
+    # The shared graph is built with planning enabled (default)
+    assert agentic_graph is not None
 
     # Get the graph structure
-    nodes = graph.get_graph().nodes
+    nodes = agentic_graph.get_graph().nodes
     node_names = {name for name in nodes if not name.startswith("__")}
 
     # Should have all nodes including planner and replan
@@ -353,3 +338,175 @@ def test_agent_system_prompt_without_plan() -> None:
     assert "Implementation Plan" in prompt_with_plan
     assert plan in prompt_with_plan
     assert "Follow the implementation plan" in prompt_with_plan
+
+
+@pytest.mark.parametrize("with_todo_tools", [False, True])
+def test_tools_node_runs_tool_calls_concurrently(with_todo_tools: bool) -> None:
+    """Test that independent tool calls in one message run at the same time."""
+    import threading
+
+    from langchain_core.messages import AIMessage
+    from langchain_core.tools import StructuredTool
+    from langgraph.graph import END, START, StateGraph
+
+    from alfredo.agentic.nodes import create_tools_node
+    from alfredo.agentic.state import AgentState
+
+    # Each call only returns once both calls are running
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_peer(name: str) -> str:
+        barrier.wait()
+        return f"read {name}"
+
+    tools = [StructuredTool.from_function(wait_for_peer, name="wait_for_peer", description="Wait for a peer call")]
+    if with_todo_tools:
+        tools.append(StructuredTool.from_function(lambda: "", name="read_todo_list", description="Read todos"))
+
+    graph = StateGraph(AgentState)
+    graph.add_node("tools", create_tools_node(tools))
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "wait_for_peer", "args": {"name": "a.txt"}, "id": "1"},
+            {"name": "wait_for_peer", "args": {"name": "b.txt"}, "id": "2"},
+        ],
+    )
+    result = graph.compile().invoke({"messages": [message], "task": "test", "plan": ""})
+
+    tool_messages = result["messages"][1:]
+    assert [m.tool_call_id for m in tool_messages] == ["1", "2"]
+    assert [m.content for m in tool_messages] == ["read a.txt", "read b.txt"]
+
+
+@pytest.mark.parametrize("with_todo_tools", [False, True])
+def test_tools_node_awaits_tool_calls_together(with_todo_tools: bool) -> None:
+    """Test that ainvoke awaits the tool calls of one message together."""
+    import asyncio
+
+    from langchain_core.messages import AIMessage
+    from langchain_core.tools import StructuredTool
+    from langgraph.graph import END, START, StateGraph
+
+    from alfredo.agentic.nodes import create_tools_node
+    from alfredo.agentic.state import AgentState
+    from alfredo.tools.handlers.todo import TodoStateManager
+
+    async def run() -> Any:
+        # Each call only returns once both calls are running
+        started: list[str] = []
+        both_started = asyncio.Event()
+
+        async def wait_for_peer(name: str) -> str:
+            started.append(name)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=5)
+            return f"read {name}"
+
+        tools = [
+            StructuredTool.from_function(coroutine=wait_for_peer, name="wait_for_peer", description="Wait for a peer")
+        ]
+        if with_todo_tools:
+            tools.append(StructuredTool.from_function(lambda: "", name="read_todo_list", description="Read todos"))
+
+        graph = StateGraph(AgentState)
+        graph.add_node("tools", create_tools_node(tools))
+        graph.add_edge(START, "tools")
+        graph.add_edge("tools", END)
+
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "wait_for_peer", "args": {"name": "a.txt"}, "id": "1"},
+                {"name": "wait_for_peer", "args": {"name": "b.txt"}, "id": "2"},
+            ],
+        )
+        return await graph.compile().ainvoke({
+            "messages": [message],
+            "task": "test",
+            "plan": "",
+            "todo_list": "1. [ ] x",
+        })
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        TodoStateManager().clear()
+
+    assert [m.content for m in result["messages"][1:]] == ["read a.txt", "read b.txt"]
+    assert result["todo_list"] == "1. [ ] x"
+
+
+def test_agent_node_reuses_system_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the agent node rebuilds its system prompt only when task or plan change."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from langchain_core.messages import HumanMessage
+
+    from alfredo.agentic import nodes
+
+    calls: list[tuple[str, str]] = []
+    build_prompt = nodes.get_agent_system_prompt
+
+    def counting_prompt(task: str, plan: str, **kwargs: Any) -> str:
+        calls.append((task, plan))
+        return build_prompt(task, plan, **kwargs)
+
+    monkeypatch.setattr(nodes, "get_agent_system_prompt", counting_prompt)
+    agent_node = nodes.create_agent_node(FakeListChatModel(responses=["ok"]), tools=[])
+
+    state: Any = {"messages": [HumanMessage(content="Task: t")], "task": "t", "plan": "1. Do it"}
+    agent_node(state)
+    agent_node(state)
+    assert calls == [("t", "1. Do it")]
+
+    agent_node({**state, "plan": "2. Redo it"})
+    assert calls == [("t", "1. Do it"), ("t", "2. Redo it")]
+
+
+@pytest.mark.parametrize("with_todo_tools", [False, True])
+def test_tools_node_honours_max_concurrency(with_todo_tools: bool) -> None:
+    """Test that the run config's max_concurrency limits concurrent tool calls."""
+    import threading
+    import time
+
+    from langchain_core.messages import AIMessage
+    from langchain_core.tools import StructuredTool
+    from langgraph.graph import END, START, StateGraph
+
+    from alfredo.agentic.nodes import create_tools_node
+    from alfredo.agentic.state import AgentState
+
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def track(name: str) -> str:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return name
+
+    tools = [StructuredTool.from_function(track, name="track", description="Track concurrent calls")]
+    if with_todo_tools:
+        tools.append(StructuredTool.from_function(lambda: "", name="read_todo_list", description="Read todos"))
+
+    graph = StateGraph(AgentState)
+    graph.add_node("tools", create_tools_node(tools))
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+
+    message = AIMessage(
+        content="",
+        tool_calls=[{"name": "track", "args": {"name": str(i)}, "id": str(i)} for i in range(3)],
+    )
+    result = graph.compile().invoke({"messages": [message], "task": "test", "plan": ""}, {"max_concurrency": 1})
+
+    assert [m.content for m in result["messages"][1:]] == ["0", "1", "2"]
+    assert peak[0] == 1
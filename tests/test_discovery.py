@@ -0,0 +1,353 @@
+"""Tests for file discovery tool handlers."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from alfredo.tools.handlers.discovery import (
+    ListFilesHandler,
+    SearchFilesHandler,
+)
+
+
+@pytest.fixture
+def temp_tree() -> Any:
+    """Create a temporary directory with a small file tree."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_path = Path(tmpdir)
+
+        (temp_path / "main.py").write_text("import os\n\ndef main():\n    return os.getcwd()\n")
+        (temp_path / "notes.txt").write_text("first line\nTODO: write docs\nlast line\n")
+        (temp_path / "pkg").mkdir()
+        (temp_path / "pkg" / "util.py").write_text("# TODO: refactor\nVALUE = 1\n")
+        (temp_path / "image.bin").write_bytes(b"\x89PNG\x00\xff\xfe TODO")
+
+        yield temp_path
+
+
+def test_search_files_finds_matches(temp_tree: Path) -> None:
+    """Test that matches are reported with file and line number."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
+    assert "notes.txt:" in result.output
+    assert "  2: TODO: write docs" in result.output
+    assert "  1: # TODO: refactor" in result.output
+
+
+def test_search_files_skips_binary(temp_tree: Path) -> None:
+    """Test that binary files are not searched."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "image.bin" not in result.output
+
+
+def test_search_files_file_pattern(temp_tree: Path) -> None:
+    """Test that file_pattern restricts the searched files."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO", "file_pattern": "*.py"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "notes.txt" not in result.output
+
+
+def test_search_files_no_matches(temp_tree: Path) -> None:
+    """Test output when nothing matches."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "does-not-appear"})
+    assert result.success
+    assert "No matches found" in result.output
+
+
+def test_search_files_invalid_regex(temp_tree: Path) -> None:
+    """Test error handling for an invalid regex."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "("})
+    assert not result.success
+    assert result.error is not None
+    assert "Invalid regex pattern" in result.error
+
+
+def test_search_files_many_files_keeps_order(temp_tree: Path) -> None:
+    """Test that searching a large tree reports files in sorted order."""
+    many = temp_tree / "many"
+    many.mkdir()
+    for i in reversed(range(100)):
+        (many / f"file_{i:03d}.txt").write_text(f"line\nneedle {i}\n")
+
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": "many", "regex": "needle"})
+    assert result.success
+    assert "Found 100 match(es)" in result.output
+    reported = [line.rstrip(":") for line in result.output.splitlines() if line.startswith("many/")]
+    assert reported == [f"many/file_{i:03d}.txt" for i in range(100)]
+
+
+def test_search_files_skips_vcs_and_cache_directories(temp_tree: Path) -> None:
+    """Test that VCS metadata and caches are not searched."""
+    (temp_tree / ".git").mkdir()
+    (temp_tree / ".git" / "HEAD").write_text("TODO in git\n")
+    (temp_tree / "node_modules" / "dep").mkdir(parents=True)
+    (temp_tree / "node_modules" / "dep" / "index.js").write_text("// TODO dep\n")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
+    assert ".git" not in result.output
+    assert "node_modules" not in result.output
+
+
+def test_search_files_nested_file_pattern(temp_tree: Path) -> None:
+    """Test glob patterns with a directory component."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO", "file_pattern": "pkg/*.py"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "pkg/util.py:" in result.output
+
+
+def test_list_files_top_level(temp_tree: Path) -> None:
+    """Test listing only the top level of a directory."""
+    handler = ListFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": "."})
+    assert result.success
+    assert "[DIR]  pkg/" in result.output
+    assert "[FILE] main.py" in result.output
+    assert "util.py" not in result.output
+
+
+def test_list_files_recursive(temp_tree: Path) -> None:
+    """Test recursive listing."""
+    handler = ListFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "recursive": "true"})
+    assert result.success
+    assert "[FILE] pkg/util.py" in result.output
+
+
+def test_list_files_recursive_skips_vcs_contents(temp_tree: Path) -> None:
+    """Test that skipped directories are listed but not entered."""
+    (temp_tree / ".git").mkdir()
+    (temp_tree / ".git" / "HEAD").write_text("ref")
+    handler = ListFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "recursive": "true"})
+    assert result.success
+    assert "[DIR]  .git/" in result.output
+    assert "HEAD" not in result.output
+
+
+def test_list_files_not_a_directory(temp_tree: Path) -> None:
+    """Test error handling when path is a file."""
+    handler = ListFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": "main.py"})
+    assert not result.success
+    assert result.error is not None
+    assert "not a directory" in result.error.lower()
+
+
+def test_search_files_matches_within_single_lines(temp_tree: Path) -> None:
+    """Test that anchors apply per line and matches never span lines."""
+    (temp_tree / "span.txt").write_text("alpha\nbeta\nalpha beta\n")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": r"alpha\s+beta", "file_pattern": "span.txt"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "  3: alpha beta" in result.output
+
+    result = handler.execute({"path": ".", "regex": "^beta$", "file_pattern": "span.txt"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "  2: beta" in result.output
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"(?<=\s)bar", []),
+        (r"(?<=\n)bar", []),
+        (r"foo(?=\n)", []),
+        (r"(?<!x\n)bar", ["  2: bar"]),
+        (r"\Afoo", ["  3: foo", "  4: foo"]),
+        (r"foo\Z", ["  3: foo", "  4: foo"]),
+        (r"x[^;]*foo", []),
+        (r"[^#]+", ["  1: x", "  2: bar", "  3: foo", "  4: foo"]),
+        (r"x\W*bar", []),
+        ("(?s)x.*bar", []),
+    ],
+)
+def test_search_files_patterns_see_one_line(temp_tree: Path, pattern: str, expected: list[str]) -> None:
+    """Test that lookarounds, string anchors and negated classes apply to each line alone."""
+    (temp_tree / "lines.txt").write_text("x\nbar\nfoo\nfoo\n")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": pattern, "file_pattern": "lines.txt"})
+    assert result.success
+    assert [line for line in result.output.splitlines() if line.startswith("  ")] == expected
+
+
+def test_search_files_python_only_syntax(temp_tree: Path) -> None:
+    """Test that Python-only syntax such as lookbehinds is supported."""
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": r"(?<=# )TODO"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "  1: # TODO: refactor" in result.output
+
+
+def test_list_files_recursive_many_subdirectories(temp_tree: Path) -> None:
+    """Test that wide trees list each subtree right after its directory."""
+    for name in ["d1", "d2", "d3", "d4", "d5"]:
+        (temp_tree / name / "inner").mkdir(parents=True)
+        (temp_tree / name / "inner" / "f.txt").write_text("x")
+    handler = ListFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "recursive": "true"})
+    assert result.success
+    lines = result.output.splitlines()[2:]
+    assert lines[:4] == ["[DIR]  d1/", "[DIR]  d1/inner/", "[FILE] d1/inner/f.txt (1 bytes)", "[DIR]  d2/"]
+    assert lines[-3:] == ["[FILE] notes.txt (38 bytes)", "[DIR]  pkg/", "[FILE] pkg/util.py (27 bytes)"]
+
+
+def test_search_files_across_read_blocks(temp_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that line numbers stay correct when a file is read in several blocks."""
+    monkeypatch.setattr("alfredo.tools.handlers.discovery._SEARCH_BLOCK_CHARS", 8)
+    (temp_tree / "long.txt").write_text("".join(f"row {i}\n" for i in range(1, 51)) + "row end")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": r"^row (7|42|end)$", "file_pattern": "long.txt"})
+    assert result.success
+    assert "Found 3 match(es)" in result.output
+    assert "  7: row 7" in result.output
+    assert "  42: row 42" in result.output
+    assert "  51: row end" in result.output
+
+
+@pytest.mark.parametrize("pattern", [".*", "$", "x*", "foo|", "(TODO)?"])
+@pytest.mark.parametrize("block_chars", [8, None])
+def test_search_files_empty_matches_without_trailing_newline(
+    temp_tree: Path, monkeypatch: pytest.MonkeyPatch, pattern: str, block_chars: int | None
+) -> None:
+    """Test that patterns matching the empty string report each line once."""
+    if block_chars is not None:
+        monkeypatch.setattr("alfredo.tools.handlers.discovery._SEARCH_BLOCK_CHARS", block_chars)
+    (temp_tree / "code.py").write_text("def f():\n    return 1\n\nx = f()")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": pattern, "file_pattern": "code.py"})
+    assert result.success
+    assert [line for line in result.output.splitlines() if line.startswith("  ")] == [
+        "  1: def f():",
+        "  2:     return 1",
+        "  3: ",
+        "  4: x = f()",
+    ]
+
+
+def test_search_files_anchors_per_line_across_real_blocks(temp_tree: Path) -> None:
+    """Test that \\A and \\Z anchor to each line in a file spanning several read blocks."""
+    from alfredo.tools.handlers.discovery import _SEARCH_BLOCK_CHARS
+
+    row = "filler line of text\n"
+    rows = _SEARCH_BLOCK_CHARS // len(row) + 10
+    (temp_tree / "huge.txt").write_text("start here\n" + row * rows + "the end\n")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": r"\A(start|the)", "file_pattern": "huge.txt"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
+    assert "  1: start here" in result.output
+    assert f"  {rows + 2}: the end" in result.output
+
+    result = handler.execute({"path": ".", "regex": r"(here|end)\Z", "file_pattern": "huge.txt"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
+
+    # Every filler line matches, including the ones that start a read block
+    result = handler.execute({"path": ".", "regex": r"\Afiller", "file_pattern": "huge.txt"})
+    assert result.success
+    assert f"Found {rows} match(es)" in result.output
+
+
+def test_search_files_skips_nul_bytes(temp_tree: Path) -> None:
+    """Test that files with NUL bytes are treated as binary even if they decode."""
+    (temp_tree / "data.dat").write_bytes(b"TODO\x00\x00\x01")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "data.dat" not in result.output
+
+
+def test_search_files_max_file_bytes(temp_tree: Path) -> None:
+    """Test that oversized files are skipped and reported."""
+    handler = SearchFilesHandler(cwd=str(temp_tree), max_file_bytes=30)
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "notes.txt" not in result.output
+    assert "Skipped 2 file(s) larger than 30 bytes." in result.output
+
+    handler = SearchFilesHandler(cwd=str(temp_tree), max_file_bytes=None)
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert "Found 2 match(es)" in result.output
+    assert "Skipped" not in result.output
+
+
+def test_search_files_without_fwalk(temp_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the plain os.walk fallback used where os.fwalk is unavailable."""
+    monkeypatch.setattr("alfredo.tools.handlers.discovery._HAVE_FWALK", False)
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO", "file_pattern": "pkg/*.py"})
+    assert result.success
+    assert "Found 1 match(es)" in result.output
+    assert "  1: # TODO: refactor" in result.output
+
+
+def test_search_files_skips_binary_suffixes(temp_tree: Path) -> None:
+    """Test that known binary formats are skipped by suffix alone."""
+    (temp_tree / "logo.PNG").write_text("TODO hidden in an image\n")
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
+    assert "logo.PNG" not in result.output
+
+
+def test_search_files_falls_back_without_noatime(temp_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that files not owned by the user are still searched when O_NOATIME is refused."""
+    noatime = 0o1000000
+    real_open = os.open
+
+    def refusing_open(path: Any, flags: int, *args: Any, **kwargs: Any) -> int:
+        if flags & noatime:
+            raise PermissionError
+        return real_open(path, flags, *args, **kwargs)
+
+    monkeypatch.setattr("alfredo.tools.handlers.discovery._O_NOATIME", noatime)
+    monkeypatch.setattr("alfredo.tools.handlers.discovery.os.open", refusing_open)
+    handler = SearchFilesHandler(cwd=str(temp_tree))
+
+    result = handler.execute({"path": ".", "regex": "TODO"})
+    assert result.success
+    assert "Found 2 match(es)" in result.output
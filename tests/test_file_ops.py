@@ -0,0 +1,366 @@
+"""Tests for file operation tool handlers."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from alfredo.tools.handlers.file_ops import ReadFileHandler, ReplaceInFileHandler, WriteFileHandler
+
+
+@pytest.fixture
+def temp_dir() -> Any:
+    """Create a temporary working directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def test_read_file(temp_dir: Path) -> None:
+    """Test reading a whole file."""
+    (temp_dir / "hello.txt").write_text("line 1\nline 2\nline 3\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "hello.txt"})
+    assert result.success
+    assert result.output == "line 1\nline 2\nline 3\n"
+
+
+def test_read_file_offset_and_limit(temp_dir: Path) -> None:
+    """Test reading a range of lines."""
+    (temp_dir / "hello.txt").write_text("line 1\nline 2\nline 3\nline 4\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "hello.txt", "offset": "1", "limit": "2"})
+    assert result.success
+    assert result.output == "[Showing lines 2-3 of 4 total lines]\n\nline 2\nline 3\n"
+
+
+def test_read_file_large_file_line_range(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that line ranges of large (memory-mapped) files match small-file reads."""
+    monkeypatch.setattr("alfredo.tools.handlers.file_ops._MMAP_READ_THRESHOLD", 16)
+    monkeypatch.setattr("alfredo.tools.handlers.file_ops._LINE_SCAN_CHUNK", 7)
+    (temp_dir / "big.txt").write_text("".join(f"line {i}\n" for i in range(1, 101)) + "tail")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "big.txt", "offset": "49", "limit": "2"})
+    assert result.success
+    assert result.output == "[Showing lines 50-51 of 101 total lines]\n\nline 50\nline 51\n"
+
+    result = handler.execute({"path": "big.txt", "offset": "99"})
+    assert result.success
+    assert result.output == "[Showing lines 100-101 of 101 total lines]\n\nline 100\ntail"
+
+    result = handler.execute({"path": "big.txt", "offset": "101"})
+    assert not result.success
+    assert result.error is not None
+    assert "exceeds total lines (101)" in result.error
+
+
+@pytest.mark.parametrize("newlines", [["\r"], ["\r\n"], ["\n", "\r", "\r\n"]])
+def test_read_file_large_file_universal_newlines(
+    temp_dir: Path, monkeypatch: pytest.MonkeyPatch, newlines: list[str]
+) -> None:
+    """Test that large files split lines on CR and CRLF exactly as small-file reads do."""
+    from alfredo.tools.handlers import file_ops
+
+    lines = [f"row {i:06d} of a file with old line endings" for i in range(10_000)]
+    (temp_dir / "big.txt").write_bytes(
+        "".join(line + newlines[i % len(newlines)] for i, line in enumerate(lines)).encode()
+    )
+    assert (temp_dir / "big.txt").stat().st_size > file_ops._MMAP_READ_THRESHOLD
+    handler = ReadFileHandler(cwd=str(temp_dir))
+    requests = [
+        {"offset": "0", "limit": "3"},
+        {"offset": "5000", "limit": "2"},
+        {"offset": "9999"},
+        {"offset": "10000"},
+    ]
+
+    large = [handler.execute({"path": "big.txt", **request}) for request in requests]
+    monkeypatch.setattr(file_ops, "_MMAP_READ_THRESHOLD", 1 << 30)
+    small = [handler.execute({"path": "big.txt", **request}) for request in requests]
+
+    assert [(r.success, r.output, r.error) for r in large] == [(r.success, r.output, r.error) for r in small]
+    assert large[1].output == f"[Showing lines 5001-5002 of 10000 total lines]\n\n{lines[5000]}\n{lines[5001]}\n"
+
+
+def test_read_file_counts_lines_by_newline(temp_dir: Path) -> None:
+    """Test that only newlines end lines, so form feeds stay inside a line."""
+    (temp_dir / "ff.txt").write_text("one\n\x0ctwo\x0cstill two\nthree\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "ff.txt", "offset": "1", "limit": "1"})
+    assert result.success
+    assert result.output == "[Showing lines 2-2 of 3 total lines]\n\n\x0ctwo\x0cstill two\n"
+
+
+def test_read_file_offset_past_end(temp_dir: Path) -> None:
+    """Test error handling for an offset beyond the last line."""
+    (temp_dir / "hello.txt").write_text("line 1\nline 2\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "hello.txt", "offset": "5"})
+    assert not result.success
+    assert result.error is not None
+    assert "exceeds total lines (2)" in result.error
+
+
+def test_read_file_limit_bytes_utf8_boundary(temp_dir: Path) -> None:
+    """Test that byte limits never split a multi-byte character."""
+    (temp_dir / "utf8.txt").write_text("aé€b", encoding="utf-8")  # 1 + 2 + 3 + 1 bytes
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "utf8.txt", "limit_bytes": "5"})
+    assert result.success
+    assert result.output == "[Showing first 3 bytes of 7 total bytes]\n\naé"
+
+    result = handler.execute({"path": "utf8.txt", "limit_bytes": "100"})
+    assert result.success
+    assert result.output == "aé€b"
+
+
+def test_read_file_limit_bytes_binary_and_crlf(temp_dir: Path) -> None:
+    """Test byte limits on binary files and Windows line endings."""
+    (temp_dir / "blob.bin").write_bytes(b"\x89PNG\x00\xff\xfe" * 10)
+    (temp_dir / "crlf.txt").write_bytes(b"one\r\ntwo\r\nthree\r\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "blob.bin", "limit_bytes": "20"})
+    assert not result.success
+    assert result.error is not None
+    assert "binary" in result.error
+
+    result = handler.execute({"path": "crlf.txt", "limit_bytes": "10"})
+    assert result.success
+    assert result.output == "[Showing first 10 bytes of 17 total bytes]\n\none\ntwo\n"
+
+
+def test_read_file_invalid_params(temp_dir: Path) -> None:
+    """Test parameter validation."""
+    (temp_dir / "hello.txt").write_text("line 1\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "hello.txt", "limit": "10", "limit_bytes": "10"})
+    assert not result.success
+    assert result.error == "Cannot use both 'limit' and 'limit_bytes' parameters"
+
+    result = handler.execute({"path": "hello.txt", "offset": "-1"})
+    assert not result.success
+    assert result.error == "Offset must be non-negative"
+
+    result = handler.execute({"path": "hello.txt", "limit": "abc"})
+    assert not result.success
+    assert result.error == "Invalid limit value: abc"
+
+
+def test_read_file_binary(temp_dir: Path) -> None:
+    """Test that binary files are rejected."""
+    (temp_dir / "blob.bin").write_bytes(b"\x89PNG\x00\xff\xfe")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "blob.bin"})
+    assert not result.success
+    assert result.error is not None
+    assert "binary" in result.error
+
+
+def test_read_file_missing(temp_dir: Path) -> None:
+    """Test error handling for a missing file."""
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "missing.txt"})
+    assert not result.success
+    assert result.error == "File not found: missing.txt"
+
+
+def test_read_file_not_a_file(temp_dir: Path) -> None:
+    """Test error handling for directories and paths through a file."""
+    (temp_dir / "sub").mkdir()
+    (temp_dir / "hello.txt").write_text("hi\n")
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "sub"})
+    assert not result.success
+    assert result.error == "Path is not a file: sub"
+
+    result = handler.execute({"path": "hello.txt/inner"})
+    assert not result.success
+    assert result.error is not None
+    assert result.error.startswith("File not found")
+
+
+def test_write_file_creates_directories(temp_dir: Path) -> None:
+    """Test that writing creates parent directories."""
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "a/b/new.txt", "content": "hello"})
+    assert result.success
+    assert (temp_dir / "a" / "b" / "new.txt").read_text() == "hello"
+
+
+def test_replace_in_file(temp_dir: Path) -> None:
+    """Test applying multiple SEARCH/REPLACE blocks."""
+    (temp_dir / "code.py").write_text("a = 1\nb = 2\nc = 3\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    diff = "------- SEARCH\na = 1\n=======\na = 10\n+++++++ REPLACE\n------- SEARCH\nc = 3\n=======\nc = 30\n+++++++ REPLACE"
+    result = handler.execute({"path": "code.py", "diff": diff})
+    assert result.success
+    assert result.output == "Successfully updated file: code.py"
+    assert (temp_dir / "code.py").read_text() == "a = 10\nb = 2\nc = 30\n"
+
+
+def test_replace_in_file_first_occurrence_only(temp_dir: Path) -> None:
+    """Test that each block replaces only the first occurrence."""
+    (temp_dir / "code.py").write_text("x\nx\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "code.py", "diff": "------- SEARCH\nx\n=======\ny\n+++++++ REPLACE"})
+    assert result.success
+    assert (temp_dir / "code.py").read_text() == "y\nx\n"
+
+
+def test_replace_in_file_without_replace_marker(temp_dir: Path) -> None:
+    """Test the fallback format without a trailing REPLACE marker."""
+    (temp_dir / "code.py").write_text("a = 1\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "code.py", "diff": "------- SEARCH\na = 1\n=======\na = 2"})
+    assert result.success
+    assert (temp_dir / "code.py").read_text() == "a = 2\n"
+
+
+def test_replace_in_file_search_not_found(temp_dir: Path) -> None:
+    """Test that a missing search block fails without touching the file."""
+    (temp_dir / "code.py").write_text("a = 1\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    diff = "------- SEARCH\na = 1\n=======\na = 2\n+++++++ REPLACE\n------- SEARCH\nzzz\n=======\n\n+++++++ REPLACE"
+    result = handler.execute({"path": "code.py", "diff": diff})
+    assert not result.success
+    assert result.error is not None
+    assert "Block 2: Search text not found" in result.error
+    assert (temp_dir / "code.py").read_text() == "a = 1\n"
+
+
+def test_replace_in_file_no_blocks(temp_dir: Path) -> None:
+    """Test error handling for a diff with no blocks."""
+    (temp_dir / "code.py").write_text("a = 1\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "code.py", "diff": "not a diff"})
+    assert not result.success
+    assert result.error == "Diff error: No valid SEARCH/REPLACE blocks found in diff"
+
+
+def test_replace_in_file_blocks_out_of_order(temp_dir: Path) -> None:
+    """Test that blocks must be listed in file order."""
+    (temp_dir / "code.py").write_text("a = 1\nb = 2\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    diff = "------- SEARCH\nb = 2\n=======\nb = 20\n+++++++ REPLACE\n------- SEARCH\na = 1\n=======\na = 10\n+++++++ REPLACE"
+    result = handler.execute({"path": "code.py", "diff": diff})
+    assert not result.success
+    assert result.error is not None
+    assert "Block 2: Search text not found after the previous block" in result.error
+    assert (temp_dir / "code.py").read_text() == "a = 1\nb = 2\n"
+
+
+def test_replace_in_file_repeated_text_in_order(temp_dir: Path) -> None:
+    """Test that repeated search text matches successive occurrences."""
+    (temp_dir / "code.py").write_text("x\nx\nx\n")
+    handler = ReplaceInFileHandler(cwd=str(temp_dir))
+
+    diff = "------- SEARCH\nx\n=======\ny\n+++++++ REPLACE\n------- SEARCH\nx\n=======\nz\n+++++++ REPLACE"
+    result = handler.execute({"path": "code.py", "diff": diff})
+    assert result.success
+    assert (temp_dir / "code.py").read_text() == "y\nz\nx\n"
+
+
+def test_write_file_reports_created_and_updated(temp_dir: Path) -> None:
+    """Test that new files are reported as created and existing ones as updated."""
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "new.txt", "content": "one"})
+    assert result.output == "Created file: new.txt"
+
+    result = handler.execute({"path": "new.txt", "content": "two"})
+    assert result.output == "Updated file: new.txt"
+    assert (temp_dir / "new.txt").read_text() == "two"
+    assert [p.name for p in temp_dir.iterdir()] == ["new.txt"]  # No temporary files left behind
+
+
+def test_write_file_keeps_permissions_and_symlinks(temp_dir: Path) -> None:
+    """Test that overwriting keeps the file mode and writes through symlinks."""
+    target = temp_dir / "script.sh"
+    target.write_text("echo old\n")
+    target.chmod(0o755)
+    (temp_dir / "link.sh").symlink_to(target)
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "link.sh", "content": "echo new\n"})
+    assert result.success
+    assert (temp_dir / "link.sh").is_symlink()
+    assert target.read_text() == "echo new\n"
+    assert target.stat().st_mode & 0o777 == 0o755
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() == 0, reason="root may write read-only files")
+def test_write_file_refuses_read_only_file(temp_dir: Path) -> None:
+    """Test that a read-only file is not silently replaced."""
+    target = temp_dir / "locked.txt"
+    target.write_text("keep me\n")
+    target.chmod(0o444)
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "locked.txt", "content": "overwritten\n"})
+    assert not result.success
+    assert result.error is not None
+    assert "Permission denied" in result.error
+    assert target.read_text() == "keep me\n"
+
+
+def test_write_file_keeps_hard_links(temp_dir: Path) -> None:
+    """Test that a hard-linked file is rewritten in place, so every link sees the new content."""
+    target = temp_dir / "data.txt"
+    target.write_text("old\n")
+    (temp_dir / "alias.txt").hardlink_to(target)
+    inode = target.stat().st_ino
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "data.txt", "content": "new\n"})
+    assert result.success
+    assert target.stat().st_ino == inode
+    assert (temp_dir / "alias.txt").read_text() == "new\n"
+
+
+def test_write_file_through_dangling_symlink(temp_dir: Path) -> None:
+    """Test that a dangling symlink is written through rather than replaced."""
+    (temp_dir / "link.txt").symlink_to(temp_dir / "missing.txt")
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "link.txt", "content": "hello\n"})
+    assert result.success
+    assert (temp_dir / "link.txt").is_symlink()
+    assert (temp_dir / "missing.txt").read_text() == "hello\n"
+
+
+def test_get_relative_path(temp_dir: Path) -> None:
+    """Test relative path display for paths inside and outside the working directory."""
+    handler = ReadFileHandler(cwd=str(temp_dir))
+
+    assert handler.get_relative_path(temp_dir / "a" / "b.txt") == str(Path("a") / "b.txt")
+    assert handler.get_relative_path(temp_dir) == "."
+    assert handler.get_relative_path(temp_dir.parent / "other.txt") == str(temp_dir.parent / "other.txt")
+
+
+def test_write_file_large_unicode_content(temp_dir: Path) -> None:
+    """Test that large non-ASCII content is written in full."""
+    content = "héllo wörld €\n" * 200_000
+    handler = WriteFileHandler(cwd=str(temp_dir))
+
+    result = handler.execute({"path": "big.txt", "content": content})
+    assert result.success
+    assert (temp_dir / "big.txt").read_text(encoding="utf-8") == content
@@ -104,6 +104,30 @@ def test_langchain_tool_write_and_read() -> None:
         assert "LangChain test" in read_result
 
 
+@pytest.mark.skipif(not LANGCHAIN_AVAILABLE, reason="LangChain not installed")
+def test_langchain_tool_async_invocation() -> None:
+    """Test that tools can be awaited and run concurrently through ainvoke."""
+    import asyncio
+
+    with TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "a.txt").write_text("first file")
+        Path(tmpdir, "b.txt").write_text("second file")
+        read_tool = create_langchain_tool("read_file", cwd=tmpdir)
+
+        async def read_both() -> list[str]:
+            return await asyncio.gather(
+                read_tool.ainvoke({"path": "a.txt"}),
+                read_tool.ainvoke({"path": "b.txt"}),
+                read_tool.ainvoke({"path": "missing.txt"}),
+            )
+
+        first, second, missing = asyncio.run(read_both())
+
+    assert "first file" in first
+    assert "second file" in second
+    assert missing.startswith("Error: File not found")
+
+
 @pytest.mark.skipif(not LANGCHAIN_AVAILABLE, reason="LangChain not installed")
 def test_langchain_tool_list_files() -> None:
     """Test list_files through LangChain."""
@@ -191,8 +215,10 @@ def test_langchain_web_fetch() -> None:
     mock_response.headers = {"content-type": "text/html"}
     mock_response.text = "<html><body><h1>Test</h1></body></html>"
     mock_response.raise_for_status = Mock()
+    mock_response.encoding = "utf-8"
+    mock_response.iter_content.return_value = [mock_response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=mock_response):
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=mock_response):
         # Create tool
         tool = create_langchain_tool("web_fetch")
 
@@ -0,0 +1,61 @@
+"""Tests for the tool registry."""
+
+import pytest
+
+from alfredo.tools.registry import ToolRegistry, registry
+from alfredo.tools.specs import ModelFamily, ToolSpec
+
+
+@pytest.fixture
+def fresh_registry() -> ToolRegistry:
+    """Create a registry separate from the global singleton."""
+    fresh = object.__new__(ToolRegistry)
+    fresh.clear()
+    return fresh
+
+
+def test_registry_is_singleton() -> None:
+    """Test that ToolRegistry() returns the global registry."""
+    assert ToolRegistry() is registry
+
+
+def test_get_spec_prefers_variant_and_falls_back_to_generic(fresh_registry: ToolRegistry) -> None:
+    """Test that get_spec returns the variant spec, then the GENERIC one."""
+    generic = ToolSpec(id="tool", name="tool", description="generic")
+    anthropic = ToolSpec(id="tool", name="tool", description="anthropic", variant=ModelFamily.ANTHROPIC)
+    fresh_registry.register_spec(generic)
+    fresh_registry.register_spec(anthropic)
+
+    assert fresh_registry.get_spec("tool") is generic
+    assert fresh_registry.get_spec("tool", ModelFamily.ANTHROPIC) is anthropic
+    assert fresh_registry.get_spec("tool", ModelFamily.OPENAI) is generic
+    assert fresh_registry.get_spec("missing", ModelFamily.OPENAI) is None
+
+    # Re-registering replaces the spec seen by lookups
+    replacement = ToolSpec(id="tool", name="tool", description="replacement")
+    fresh_registry.register_spec(replacement)
+    assert fresh_registry.get_spec("tool", ModelFamily.OPENAI) is replacement
+
+    fresh_registry.clear()
+    assert fresh_registry.get_spec("tool") is None
+
+
+def test_get_specs_for_variant_is_cached_until_registration(fresh_registry: ToolRegistry) -> None:
+    """Test that variant spec lists are reused and refreshed by new registrations."""
+    assert fresh_registry.get_specs_for_variant(ModelFamily.OPENAI) == ()
+
+    first = ToolSpec(id="first", name="first", description="first")
+    fresh_registry.register_spec(first)
+    specs = fresh_registry.get_specs_for_variant(ModelFamily.OPENAI)
+    assert specs == (first,)
+    assert fresh_registry.get_specs_for_variant(ModelFamily.OPENAI) is specs
+
+    # A new GENERIC spec also shows up for variants that fall back to GENERIC
+    second = ToolSpec(id="second", name="second", description="second")
+    fresh_registry.register_spec(second)
+    assert fresh_registry.get_specs_for_variant(ModelFamily.OPENAI) == (first, second)
+
+    openai = ToolSpec(id="first", name="first", description="openai", variant=ModelFamily.OPENAI)
+    fresh_registry.register_spec(openai)
+    assert fresh_registry.get_specs_for_variant(ModelFamily.OPENAI) == (openai,)
+    assert fresh_registry.get_specs_for_variant() == (first, second)
@@ -0,0 +1,97 @@
+"""Tests for tool specifications."""
+
+from typing import Any
+
+from alfredo.tools.specs import ToolParameter, ToolSpec
+
+
+def _make_spec() -> ToolSpec:
+    return ToolSpec(
+        id="fetch",
+        name="fetch",
+        description="Fetch a resource",
+        parameters=[
+            ToolParameter(name="url", required=True, instruction="URL to fetch", usage="https://example.com"),
+            ToolParameter(name="timeout", required=False, instruction="Seconds to wait", description="Default 30"),
+        ],
+    )
+
+
+def test_format_for_prompt() -> None:
+    """Test the prompt section layout."""
+    assert _make_spec().format_for_prompt() == (
+        "## fetch\n"
+        "Description: Fetch a resource\n"
+        "Parameters:\n"
+        "- url: (required) URL to fetch\n"
+        "- timeout: (optional) Seconds to wait\n"
+        "  Default 30\n"
+        "Usage:\n"
+        "<fetch>\n"
+        "<url>https://example.com</url>\n"
+        "<timeout>timeout here</timeout>\n"
+        "</fetch>"
+    )
+    assert ToolSpec(id="noop", name="noop", description="Nothing").format_for_prompt() == (
+        "## noop\nDescription: Nothing\nParameters: None\nUsage:\n<noop>\n</noop>"
+    )
+
+
+def test_format_for_prompt_reflects_changes_after_caching() -> None:
+    """Test that cached prompts are rebuilt when the spec or its parameters change."""
+    spec = _make_spec()
+    assert spec.format_for_prompt() is spec.format_for_prompt()
+
+    spec.description = "Download a resource"
+    assert "Description: Download a resource" in spec.format_for_prompt()
+
+    spec.parameters[0].instruction = "Address to download"
+    assert "- url: (required) Address to download" in spec.format_for_prompt()
+
+    spec.parameters.append(ToolParameter(name="retries", required=False, instruction="Retry count"))
+    assert "<retries>retries here</retries>" in spec.format_for_prompt()
+
+    spec.parameters.pop(0)
+    assert "<url>" not in spec.format_for_prompt()
+
+
+def test_format_for_prompt_keeps_other_specs_cached() -> None:
+    """Test that changing one spec leaves the cached prompts of other specs alone."""
+    spec, other = _make_spec(), _make_spec()
+    cached = other.format_for_prompt()
+
+    spec.description = "Download a resource"
+    spec.parameters[0].instruction = "Address to download"
+    assert "Address to download" in spec.format_for_prompt()
+    assert other.format_for_prompt() is cached
+
+
+def test_format_for_prompt_filters_parameters_by_context() -> None:
+    """Test that context requirements select parameters on every call."""
+    calls: list[dict[str, Any]] = []
+
+    def needs_auth(context: dict[str, Any]) -> bool:
+        calls.append(context)
+        return bool(context.get("auth"))
+
+    spec = _make_spec()
+    spec.parameters.append(
+        ToolParameter(name="token", required=False, instruction="Token", context_requirements=needs_auth)
+    )
+
+    assert "<token>" not in spec.format_for_prompt()
+    assert "<token>" in spec.format_for_prompt({"auth": True})
+    assert "<token>" not in spec.format_for_prompt({"auth": False})
+    assert spec.format_for_prompt({"auth": True}) is spec.format_for_prompt({"auth": 1})
+    assert calls == [{}, {"auth": True}, {"auth": False}, {"auth": True}, {"auth": 1}]
+
+
+def test_specs_use_slots() -> None:
+    """Test that specs and parameters carry no instance __dict__."""
+    spec = _make_spec()
+    assert not hasattr(spec, "__dict__")
+    assert not hasattr(spec.parameters[0], "__dict__")
+    assert spec == _make_spec()
+    spec.format_for_prompt()
+    assert spec == _make_spec()
+    assert "_prompt_cache" not in repr(spec)
@@ -0,0 +1,45 @@
+"""Tests for todo list tool handlers."""
+
+from typing import Any
+
+import pytest
+
+from alfredo.tools.handlers.todo import ReadTodoListHandler, TodoStateManager, WriteTodoListHandler
+
+
+@pytest.fixture(autouse=True)
+def clear_todo_list() -> Any:
+    """Start and end each test with an empty todo list."""
+    TodoStateManager().clear()
+    yield
+    TodoStateManager().clear()
+
+
+def test_todo_state_manager_is_singleton() -> None:
+    """Test that every TodoStateManager() call shares the same state."""
+    assert TodoStateManager() is TodoStateManager()
+
+    TodoStateManager().set_todo_list("1. [ ] Task")
+    assert TodoStateManager().get_todo_list() == "1. [ ] Task"
+
+
+def test_write_and_read_todo_list() -> None:
+    """Test that a written todo list can be read back."""
+    result = ReadTodoListHandler().execute({})
+    assert result.success
+    assert result.output == "No todo list created yet."
+
+    result = WriteTodoListHandler().execute({"content": "  1. [x] First\n2. [ ] Second  "})
+    assert result.success
+    assert result.output == "Todo list updated:\n\n1. [x] First\n2. [ ] Second"
+
+    result = ReadTodoListHandler().execute({})
+    assert result.success
+    assert result.output == "1. [x] First\n2. [ ] Second"
+
+
+def test_write_todo_list_missing_content() -> None:
+    """Test error handling for missing content."""
+    result = WriteTodoListHandler().execute({})
+    assert not result.success
+    assert result.error == "Missing required parameter: content"
@@ -3,8 +3,10 @@
 import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Any
 
 import pytest
+from langchain_core.messages import AIMessage
 
 from alfredo.tools.handlers.vision import AnalyzeImageHandler
 from alfredo.tools.registry import registry
@@ -131,6 +133,172 @@ def test_vision_handler_encode_image() -> None:
         assert decoded == img_path.read_bytes()
 
 
+def test_vision_handler_encode_large_image() -> None:
+    """Test that images spanning several encode chunks match a one-shot encoding."""
+    import base64
+
+    with TemporaryDirectory() as tmpdir:
+        img_path = Path(tmpdir) / "large.png"
+        img_path.write_bytes(os.urandom(200_001))
+
+        handler = AnalyzeImageHandler(cwd=tmpdir)
+        expected = base64.b64encode(img_path.read_bytes()).decode("ascii")
+        assert handler._encode_image(img_path) == expected
+
+        # A stale size only affects the initial buffer size, never the result
+        assert handler._encode_image(img_path, size=1000) == expected
+        assert handler._encode_image(img_path, size=500_000) == expected
+
+
+def test_vision_handler_reuses_encoding_until_image_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that repeated analyses of an unchanged image reuse its encoding."""
+    import base64
+
+    sent: list[str] = []
+    monkeypatch.setattr(
+        AnalyzeImageHandler,
+        "_analyze_with_model",
+        lambda self, image_url, prompt, model_name: sent.append(image_url) or "done",
+    )
+    AnalyzeImageHandler.clear_image_cache()
+
+    with TemporaryDirectory() as tmpdir:
+        img_path = Path(tmpdir) / "chart.png"
+        img_path.write_bytes(b"first")
+
+        handler = AnalyzeImageHandler(cwd=tmpdir)
+        assert handler.execute({"path": "chart.png"}).output == "done"
+        assert handler.execute({"path": "chart.png", "prompt": "Any text?"}).success
+        assert AnalyzeImageHandler._load_image.cache_info().hits == 1
+
+        img_path.write_bytes(b"second!")
+        assert handler.execute({"path": "chart.png"}).success
+
+    first, second = (
+        f"data:image/png;base64,{base64.b64encode(data).decode('ascii')}" for data in (b"first", b"second!")
+    )
+    assert sent == [first, first, second]
+    AnalyzeImageHandler.clear_image_cache()
+
+
+def test_vision_handler_does_not_cache_large_images(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that images above the size threshold bypass the encoding cache."""
+    from alfredo.tools.handlers import vision
+
+    monkeypatch.setattr(vision, "_MAX_CACHED_IMAGE_BYTES", 4)
+    monkeypatch.setattr(
+        AnalyzeImageHandler,
+        "_analyze_with_model",
+        lambda self, image_url, prompt, model_name: "done",
+    )
+    AnalyzeImageHandler.clear_image_cache()
+
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "small.png").write_bytes(b"tiny")
+        (Path(tmpdir) / "large.png").write_bytes(b"too large")
+
+        handler = AnalyzeImageHandler(cwd=tmpdir)
+        for _ in range(2):
+            assert handler.execute({"path": "small.png"}).success
+            assert handler.execute({"path": "large.png"}).success
+
+    cache_info = AnalyzeImageHandler._load_image.cache_info()
+    assert (cache_info.hits, cache_info.currsize) == (1, 1)
+    AnalyzeImageHandler.clear_image_cache()
+
+
+def test_vision_handler_execute_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that execute_batch sends one batch per model and keeps result order."""
+    batches: list[tuple[str, int]] = []
+
+    class FakeModel:
+        def __init__(self, model_name: str) -> None:
+            self.model_name = model_name
+
+        def batch(self, inputs: list[Any], config: dict[str, Any], return_exceptions: bool) -> list[Any]:
+            batches.append((self.model_name, len(inputs)))
+            return [
+                RuntimeError("rate limited") if "fail" in messages[0].content[0]["text"] else AIMessage(self.model_name)
+                for messages in inputs
+            ]
+
+    monkeypatch.setattr(AnalyzeImageHandler, "_init_model", staticmethod(FakeModel))
+
+    with TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "a.png").write_bytes(b"a")
+        Path(tmpdir, "b.jpg").write_bytes(b"b")
+
+        handler = AnalyzeImageHandler(cwd=tmpdir, model_name="default-model")
+        results = handler.execute_batch([
+            {"path": "a.png"},
+            {"path": "missing.png"},
+            {"path": "b.jpg", "model": "other-model"},
+            {"path": "b.jpg", "prompt": "fail"},
+            {},
+        ])
+
+    assert batches == [("default-model", 2), ("other-model", 1)]
+    assert [r.success for r in results] == [True, False, True, False, False]
+    assert results[0].output == "default-model"
+    assert results[1].error == "Image file not found: missing.png"
+    assert results[2].output == "other-model"
+    assert results[3].error == "Vision model analysis failed: Model invocation failed: rate limited"
+    assert results[4].error == "Missing required parameter: path"
+
+
+def test_vision_handler_reuses_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that each vision model is initialized once and failures are not cached."""
+    import langchain.chat_models
+
+    from alfredo.tools.handlers.vision import _get_llm
+
+    created: list[str] = []
+
+    def fake_init_chat_model(model_name: str) -> object:
+        if model_name == "broken":
+            msg = "no API key"
+            raise ValueError(msg)
+        created.append(model_name)
+        return object()
+
+    monkeypatch.setattr(langchain.chat_models, "init_chat_model", fake_init_chat_model)
+    _get_llm.cache_clear()
+
+    first = AnalyzeImageHandler._init_model("model-a")
+    assert AnalyzeImageHandler._init_model("model-a") is first
+    assert AnalyzeImageHandler._init_model("model-b") is not first
+    assert created == ["model-a", "model-b"]
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match=r"Failed to initialize vision model 'broken'.*no API key"):
+            AnalyzeImageHandler._init_model("broken")
+    assert _get_llm.cache_info().currsize == 2
+
+    _get_llm.cache_clear()
+
+
+def test_vision_handler_execute_async(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that async analysis awaits the model's ainvoke."""
+    import asyncio
+
+    class FakeModel:
+        async def ainvoke(self, messages: list[Any]) -> AIMessage:
+            return AIMessage(f"saw {messages[0].content[0]['text']}")
+
+    monkeypatch.setattr(AnalyzeImageHandler, "_init_model", staticmethod(lambda model_name: FakeModel()))
+
+    with TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "a.png").write_bytes(b"a")
+        handler = AnalyzeImageHandler(cwd=tmpdir)
+
+        result = asyncio.run(handler.execute_async({"path": "a.png", "prompt": "a cat"}))
+        assert result.success
+        assert result.output == "saw a cat"
+
+        missing = asyncio.run(handler.execute_async({"path": "missing.png"}))
+        assert missing.error == "Image file not found: missing.png"
+
+
 def test_vision_handler_get_mime_type() -> None:
     """Test MIME type detection."""
     handler = AnalyzeImageHandler(cwd=".")
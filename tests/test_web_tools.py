@@ -24,12 +24,14 @@ def mock_response() -> Mock:
     </html>
     """
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
     return response
 
 
 def test_web_fetch_success(mock_response: Mock) -> None:
     """Test successful web content fetching."""
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=mock_response):
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=mock_response):
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com"})
@@ -42,7 +44,7 @@ def test_web_fetch_success(mock_response: Mock) -> None:
 
 def test_web_fetch_http_upgrade(mock_response: Mock) -> None:
     """Test HTTP URL is upgraded to HTTPS."""
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=mock_response) as mock_get:
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=mock_response) as mock_get:
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "http://example.com"})
@@ -77,11 +79,32 @@ def test_web_fetch_missing_url() -> None:
     assert "required" in result.error.lower()
 
 
+@pytest.mark.parametrize(
+    "url", ["https://", "https:///path", "ftp://example.com/file", "example.com", " https://x.org"]
+)
+def test_web_fetch_rejects_non_http_urls(url: str) -> None:
+    """Test that URLs without an http(s) scheme and host are rejected before fetching."""
+    with patch("alfredo.tools.handlers.web._SESSION.get") as mock_get:
+        result = WebFetchHandler().execute({"url": url})
+
+    assert not result.success
+    assert result.error == f"Invalid URL format: {url}"
+    assert not mock_get.called
+
+
+def test_web_fetch_http_upgrade_is_case_insensitive(mock_response: Mock) -> None:
+    """Test that an upper-case HTTP scheme is upgraded too."""
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=mock_response) as mock_get:
+        assert WebFetchHandler().execute({"url": "HTTP://Example.com/a?b=1"}).success
+
+    assert mock_get.call_args[0][0] == "https://Example.com/a?b=1"
+
+
 def test_web_fetch_timeout() -> None:
     """Test error handling for request timeout."""
     import requests
 
-    with patch("alfredo.tools.handlers.web.requests.get", side_effect=requests.exceptions.Timeout()):
+    with patch("alfredo.tools.handlers.web._SESSION.get", side_effect=requests.exceptions.Timeout()):
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com"})
@@ -96,7 +119,7 @@ def test_web_fetch_connection_error() -> None:
     import requests
 
     with patch(
-        "alfredo.tools.handlers.web.requests.get",
+        "alfredo.tools.handlers.web._SESSION.get",
         side_effect=requests.exceptions.ConnectionError(),
     ):
         handler = WebFetchHandler()
@@ -115,8 +138,10 @@ def test_web_fetch_non_html_text_content() -> None:
     response.headers = {"content-type": "application/json"}
     response.text = '{"key": "value", "message": "Hello, world!"}'
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=response):
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response):
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://api.example.com/data"})
@@ -134,8 +159,10 @@ def test_web_fetch_binary_content() -> None:
     response.headers = {"content-type": "image/png"}
     response.text = ""
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=response):
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response):
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com/image.png"})
@@ -164,8 +191,10 @@ def test_web_fetch_html_with_scripts() -> None:
     </html>
     """
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=response):
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response):
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com"})
@@ -176,6 +205,48 @@ def test_web_fetch_html_with_scripts() -> None:
         # Scripts and styles should not appear in output
         assert "console.log" not in result.output
         assert "alert" not in result.output
+        assert "color: red" not in result.output
+
+
+@pytest.fixture(params=["html-to-markdown", "html2text"])
+def markdown_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test once per HTML converter: html-to-markdown (web-fast extra) and html2text."""
+    from alfredo.tools.handlers import web
+
+    if request.param == "html-to-markdown":
+        pytest.importorskip("html_to_markdown")
+    else:
+        monkeypatch.setattr(web, "convert", None)
+    return str(request.param)
+
+
+def test_html_to_markdown_clean_matches_default(markdown_backend: str) -> None:
+    """Test that the BeautifulSoup pre-pass does not change well-formed output."""
+    html = (
+        "<html><head><style>p { color: red; }</style><script>if (a < b) { x = '<p>no</p>'; }</script></head>"
+        "<body><h1>Title</h1><p>Some <a href='/docs'>docs</a></p><script>alert(1)</script></body></html>"
+    )
+    expected = {
+        "html-to-markdown": "# Content from https://example.com\n\n# Title\n\nSome [docs](/docs)\n",
+        "html2text": "# Content from https://example.com\n\n# Title\nSome [docs](/docs)\n",
+    }[markdown_backend]
+    handler = WebFetchHandler()
+
+    assert handler._html_to_markdown(html, "https://example.com") == expected
+    assert handler._html_to_markdown(html, "https://example.com", clean=True) == expected
+
+
+def test_html_to_markdown_keeps_links_and_emphasis(markdown_backend: str) -> None:
+    """Test the exact markdown each converter produces for links and emphasis."""
+    expected = {
+        "html-to-markdown": "# Content from https://example.com\n\n# Title\n\nSome [docs](/docs) and **bold**\n",
+        "html2text": "# Content from https://example.com\n\n# Title\nSome [docs](/docs) and **bold**\n",
+    }[markdown_backend]
+
+    markdown = WebFetchHandler()._html_to_markdown(
+        "<h1>Title</h1><p>Some <a href='/docs'>docs</a> and <b>bold</b></p>", "https://example.com"
+    )
+    assert markdown == expected
 
 
 def test_web_fetch_redirects() -> None:
@@ -185,8 +256,10 @@ def test_web_fetch_redirects() -> None:
     response.headers = {"content-type": "text/html"}
     response.text = "<html><body><h1>Final page</h1></body></html>"
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=response) as mock_get:
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response) as mock_get:
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com/redirect"})
@@ -206,8 +279,10 @@ def test_web_fetch_user_agent() -> None:
     response.headers = {"content-type": "text/html"}
     response.text = "<html><body>Test</body></html>"
     response.raise_for_status = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [response.text.encode()]
 
-    with patch("alfredo.tools.handlers.web.requests.get", return_value=response) as mock_get:
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response) as mock_get:
         handler = WebFetchHandler()
 
         result = handler.execute({"url": "https://example.com"})
@@ -220,3 +295,170 @@ def test_web_fetch_user_agent() -> None:
         headers = call_kwargs.get("headers", {})
         assert "User-Agent" in headers
         assert "Alfredo" in headers["User-Agent"]
+
+
+def test_web_fetch_shares_connection_pool() -> None:
+    """Test that fetches go through one session with a pooled HTTPS adapter."""
+    from alfredo.tools.handlers import web
+
+    adapter = web._SESSION.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == web._POOL_SIZE
+    assert web._SESSION.get_adapter("http://example.com") is adapter
+
+
+def test_web_fetch_session_keeps_no_cookies() -> None:
+    """Test that cookies set by one response are not stored or sent again."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    from alfredo.tools.handlers import web
+
+    sent_cookies: list[str | None] = []
+
+    class CookieSetter(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            sent_cookies.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=secret; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), CookieSetter)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/"
+        for _ in range(2):
+            web._SESSION.get(url, timeout=5).close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sent_cookies == [None, None]
+    assert len(web._SESSION.cookies) == 0
+
+
+def test_web_fetch_revalidates_cached_content() -> None:
+    """Test that a refetch sends the cached validators and reuses content on 304."""
+    from alfredo.tools.handlers import web
+
+    first = Mock()
+    first.status_code = 200
+    first.headers = {"content-type": "text/html", "ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    first.text = "<html><body><h1>Docs</h1></body></html>"
+    first.raise_for_status = Mock()
+    first.encoding = "utf-8"
+    first.iter_content.return_value = [first.text.encode()]
+
+    not_modified = Mock()
+    not_modified.status_code = 304
+    not_modified.headers = {}
+    not_modified.raise_for_status = Mock()
+
+    web._URL_CACHE.clear()
+    with patch("alfredo.tools.handlers.web._SESSION.get", side_effect=[first, not_modified]) as mock_get:
+        handler = WebFetchHandler()
+
+        result = handler.execute({"url": "https://example.com/docs"})
+        assert result.success
+        assert "If-None-Match" not in mock_get.call_args[1]["headers"]
+
+        cached = handler.execute({"url": "https://example.com/docs"})
+        assert cached.success
+        assert cached.output == result.output
+
+        headers = mock_get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert "Alfredo" in headers["User-Agent"]
+
+    web._URL_CACHE.clear()
+
+
+def test_web_fetch_without_validators_is_not_cached(mock_response: Mock) -> None:
+    """Test that responses without ETag or Last-Modified are not cached."""
+    from alfredo.tools.handlers import web
+
+    web._URL_CACHE.clear()
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=mock_response):
+        assert WebFetchHandler().execute({"url": "https://example.com"}).success
+
+    assert "https://example.com" not in web._URL_CACHE
+
+
+def test_web_fetch_cache_is_bounded_by_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that large outputs are not cached and old entries are evicted by total size."""
+    from alfredo.tools.handlers import web
+
+    monkeypatch.setattr(web, "_MAX_CACHED_OUTPUT_CHARS", 40)
+    monkeypatch.setattr(web, "_URL_CACHE_MAX_CHARS", 100)
+    response = Mock()
+    response.headers = {"ETag": '"v1"'}
+
+    web._URL_CACHE.clear()
+    web._cache_response("https://example.com/huge", response, "x" * 41)
+    assert "https://example.com/huge" not in web._URL_CACHE
+
+    for name in ["a", "b", "c"]:
+        web._cache_response(f"https://example.com/{name}", response, name * 40)
+    assert list(web._URL_CACHE) == ["https://example.com/b", "https://example.com/c"]
+
+    # Refetching a cached URL makes it the newest entry
+    web._cache_response("https://example.com/b", response, "b" * 40)
+    web._cache_response("https://example.com/d", response, "d" * 21)
+    assert list(web._URL_CACHE) == ["https://example.com/b", "https://example.com/d"]
+
+    # A cached URL whose new output is too large to keep is dropped
+    web._cache_response("https://example.com/b", response, "b" * 41)
+    assert list(web._URL_CACHE) == ["https://example.com/d"]
+    web._URL_CACHE.clear()
+
+
+def test_web_fetch_caps_response_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that oversized bodies are rejected while streaming and the response is closed."""
+    from alfredo.tools.handlers import web
+
+    monkeypatch.setattr(web, "_MAX_RESPONSE_BYTES", 1024 * 1024)
+
+    response = Mock()
+    response.status_code = 200
+    response.headers = {"content-type": "text/plain"}
+    response.raise_for_status = Mock()
+    response.iter_content.return_value = iter([b"x" * 600_000, b"x" * 600_000, b"never read"])
+
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response) as mock_get:
+        result = WebFetchHandler().execute({"url": "https://example.com/huge.txt"})
+
+    assert not result.success
+    assert result.error == "Response is larger than 1 MiB: https://example.com/huge.txt"
+    assert mock_get.call_args[1]["stream"] is True
+    assert next(response.iter_content.return_value) == b"never read"
+    response.close.assert_called_once()
+
+    # A Content-Length over the limit is rejected without reading the body
+    response.headers = {"content-type": "text/html", "content-length": str(2 * 1024 * 1024)}
+    response.iter_content.reset_mock()
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response):
+        result = WebFetchHandler().execute({"url": "https://example.com/huge.html"})
+
+    assert result.error == "Response is larger than 1 MiB: https://example.com/huge.html"
+    assert not response.iter_content.called
+
+
+def test_web_fetch_decodes_streamed_body_with_response_encoding() -> None:
+    """Test that streamed bodies are decoded with the response's charset."""
+    response = Mock()
+    response.status_code = 200
+    response.headers = {"content-type": "text/plain; charset=latin-1"}
+    response.encoding = "latin-1"
+    response.raise_for_status = Mock()
+    response.iter_content.return_value = [b"caf", b"\xe9"]
+
+    with patch("alfredo.tools.handlers.web._SESSION.get", return_value=response):
+        result = WebFetchHandler().execute({"url": "https://example.com/menu.txt"})
+
+    assert result.success
+    assert result.output == "café"